@@ -5,6 +5,8 @@ import time
 import logging
 import streamlit as st
 import matplotlib.pyplot as plt
+from refactor.messages import run_answer
+from refactor.polling import PollSchedule, RunFailedError, RUN_FAILURE_STATUSES
 
 # Load environment variables
 load_dotenv()
@@ -44,15 +46,18 @@ if st.button("Send Message"):
     )
 
     # Function to wait for the run to complete
-    def wait_for_run_completion(client, thread_id, run_id, sleep_interval=5):
+    def wait_for_run_completion(client, thread_id, run_id, schedule=None):
         """
         Waits for a run to complete and prints the elapsed time.
+        A run still going at the schedule's deadline is cancelled.
         :param client: The OpenAI client object.
         :param thread_id: The ID of the thread.
         :param run_id: The ID of the run.
-        :param sleep_interval: Time in seconds to wait between checks.
+        :param schedule: PollSchedule for the checks; defaults to the RUN_POLL_* environment settings.
         """
-        while True:
+        schedule = schedule or PollSchedule.from_env()
+        poll = schedule.start()
+        while poll.wait():
             try:
                 run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
                 if run.completed_at:
@@ -63,18 +68,28 @@ if st.button("Send Message"):
                     st.write(f"Run completed in {formatted_elapsed_time}")
                     logging.info(f"Run completed in {formatted_elapsed_time}")
                     
-                    # Get messages once Run is completed!
-                    messages = client.beta.threads.messages.list(thread_id=thread_id)
-                    last_message = messages.data[0]
-                    response = last_message.content[0].text.value
+                    # Get this run's messages once it is completed
+                    response = run_answer(client, thread_id, run_id)
                     st.write(f"Assistant Response: {response}")
-                    break
+                    return
+                if run.status in RUN_FAILURE_STATUSES:
+                    error = RunFailedError(run)
+                    logging.error(str(error))
+                    st.error(str(error))
+                    return
             except Exception as e:
                 logging.error(f"An error occurred while retrieving the run: {e}")
-                break
-            logging.info("Waiting for run to complete...")
-            st.write("Waiting for run to complete...")
-            time.sleep(sleep_interval)
+                return
+            # Logged, not rendered: with fast polls the page would fill up with these
+            logging.debug("Waiting for run to complete...")
+
+        # Stop the run instead of leaving it to use tokens after giving up on it
+        try:
+            client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+        except openai.OpenAIError as e:
+            logging.error(f"Could not cancel run {run_id}: {e}")
+        logging.error(f"Run {run_id} did not finish within {schedule.deadline:g}s")
+        st.error(f"Run did not finish within {schedule.deadline:g}s")
     # Function to visualize the response
     def visualize_response(response):
         # Example: Generate a bar chart from some dummy data
@@ -90,5 +105,6 @@ if st.button("Send Message"):
         # Display the chart in Streamlit
         st.pyplot(fig)
 
-    # Wait for the run to complete
-    wait_for_run_completion(client=client, thread_id=thread_id, run_id=run.id)
+    # Wait for the run to complete, showing one status line while it runs
+    with st.spinner("Waiting for run to complete..."):
+        wait_for_run_completion(client=client, thread_id=thread_id, run_id=run.id)
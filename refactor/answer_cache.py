@@ -0,0 +1,197 @@
+import math
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+
+from refactor.months import normalize_month
+
+ANSWER_CACHE_SIZE = int(os.environ.get("ANSWER_CACHE_SIZE", "256"))
+# Minimum cosine similarity of the character trigrams for a cached answer to be reused
+ANSWER_CACHE_THRESHOLD = float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.8"))
+
+# Indonesian (and loose English) words mapped to one term, so both
+# languages land on the same normalized prompt
+SYNONYMS = {
+    "penjualan": "sales", "jual": "sales", "sale": "sales",
+    "pendapatan": "revenue", "pemasukan": "revenue", "income": "revenue",
+    "pengeluaran": "expenses", "biaya": "expenses", "expense": "expenses",
+    "produk": "product", "products": "product",
+    "tertinggi": "highest", "terbesar": "highest", "max": "highest", "maximum": "highest",
+    "terendah": "lowest", "terkecil": "lowest", "min": "lowest", "minimum": "lowest",
+    "terbaik": "best", "terburuk": "worst", "rata": "average", "mean": "average",
+    "rentang": "range", "kisaran": "range",
+}
+
+# Words that change what is being asked; they are anchors and must match
+# exactly, never by text similarity
+METRIC_WORDS = {"sales", "revenue", "expenses"}
+RANK_WORDS = {
+    "highest", "lowest", "best", "worst", "most", "least", "top", "bottom",
+    "range", "average", "median",
+}
+# Anchor kinds, in the order they appear in an anchors tuple
+ANCHOR_KINDS = ("number", "month", "product", "metric", "rank")
+
+# Filler words that do not change what is being asked
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "for", "in", "on", "to", "me", "please", "show",
+    "give", "provide", "what", "is", "are", "was", "were", "data", "year", "month",
+    "dan", "di", "dari", "pada", "untuk", "yang", "tolong", "berikan", "tampilkan",
+    "tahun", "bulan", "berapa", "apa",
+}
+
+_TOKEN = re.compile(r"[a-z]+|\d+")
+# "ProductA", "product7": a product named in one word
+_PRODUCT = re.compile(r"product([a-z]|\d{1,2})")
+# "product a", "produk 7": the identifier that follows the word product
+_PRODUCT_ID = re.compile(r"[a-z]|\d{1,2}")
+
+
+def normalize_prompt(prompt):
+    """
+    Return (normalized text, anchors) for a prompt.
+
+    The text is lower-cased, stripped of punctuation and filler words, with
+    synonyms mapped to one spelling. Everything that changes the answer is
+    an anchor instead: numbers, months, product identifiers, metric words
+    and ranking words. Two prompts can only share an answer when their
+    anchors are identical, so "sales 2023" never matches "sales 2024" and
+    "highest sales" never matches "lowest sales". Anchors keep their order
+    within each kind, so "2023 vs 2024" and "2024 vs 2023" differ.
+    """
+    words = []
+    anchors = {kind: [] for kind in ANCHOR_KINDS}
+    tokens = _TOKEN.findall(prompt.lower())
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if token.isdigit():
+            anchors["number"].append(token.lstrip("0") or "0")
+            continue
+        slot = normalize_month(token)
+        if slot is not None:
+            anchors["month"].append(f"m{slot + 1}")
+            continue
+        token = SYNONYMS.get(token, token)
+        product = _PRODUCT.fullmatch(token)
+        if product:
+            anchors["product"].append(product.group(1).lstrip("0") or "0")
+            continue
+        if token == "product" and i < len(tokens) and _PRODUCT_ID.fullmatch(tokens[i]):
+            anchors["product"].append(tokens[i].lstrip("0") or "0")
+            i += 1
+            continue
+        if token in METRIC_WORDS:
+            anchors["metric"].append(token)
+        elif token in RANK_WORDS:
+            anchors["rank"].append(token)
+        elif token not in STOPWORDS:
+            words.append(token)
+
+    key = tuple(
+        (kind, tuple(dict.fromkeys(values))) for kind, values in anchors.items() if values
+    )
+    return " ".join(sorted(set(words))), key
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _cosine(a, b):
+    dot = sum(count * b[gram] for gram, count in a.items() if gram in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm
+
+
+class AnswerCache:
+    """
+    Assistant answers reused for near-identical prompts.
+
+    Prompts are normalized with `normalize_prompt`. An exact match on the
+    normalized text is a dict lookup; otherwise the prompts with the same
+    anchors are compared by character-trigram cosine similarity and the
+    best one at or above `threshold` is returned. Every answer is tied to
+    the sales data version it was produced from, and a lookup with a
+    different version empties the cache.
+    """
+
+    def __init__(self, threshold=ANSWER_CACHE_THRESHOLD, max_entries=ANSWER_CACHE_SIZE):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        # (text, anchors) -> (trigrams, answer)
+        self._entries = OrderedDict()
+        # anchors -> keys of the entries with those anchors
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self._buckets.clear()
+            self.version = version
+
+    def get(self, prompt, version):
+        """
+        Return a cached answer for a prompt similar enough to `prompt`, or None.
+
+        A `version` of None (the data version is unknown) never hits.
+        """
+        if version is None:
+            return None
+
+        text, anchors = normalize_prompt(prompt)
+        key = (text, anchors)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                grams = _trigrams(text)
+                best, best_score = None, self.threshold
+                for candidate in self._buckets.get(anchors, ()):
+                    score = _cosine(grams, self._entries[candidate][0])
+                    if score >= best_score:
+                        best, best_score = candidate, score
+                key = best
+                entry = self._entries.get(best) if best is not None else None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, prompt, version, answer):
+        if version is None or not answer:
+            return
+
+        text, anchors = normalize_prompt(prompt)
+        key = (text, anchors)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (_trigrams(text), answer)
+            self._entries.move_to_end(key)
+            self._buckets.setdefault(anchors, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                (old_text, old_anchors), _ = self._entries.popitem(last=False)
+                bucket = self._buckets[old_anchors]
+                bucket.discard((old_text, old_anchors))
+                if not bucket:
+                    del self._buckets[old_anchors]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def __len__(self):
+        return len(self._entries)
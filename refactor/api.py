@@ -1,450 +1,187 @@
-from flask import Flask, jsonify, request, abort
+import os
+import time
+from datetime import datetime, timezone
+from flask import Flask, g, jsonify, request, abort
+from werkzeug.http import is_resource_modified
+from refactor.metrics import CONTENT_TYPE, SIZE_BUCKETS, MetricsRegistry
+from refactor.months import normalize_month
+from refactor.response_cache import ResponseCache
+from refactor.sales_store import DIMENSIONS, METRICS, MONTHS_PER_YEAR, SalesStore
 
 app = Flask(__name__)
 
-# Dummy data for sales, revenue, and expenses
-data = {
-    "2024": {
-        "Januari": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Februari": {
-            "products": {
-                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
-            }
-        },
-        "Maret": {
-            "products": {
-                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
-                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
-            }
-        },
-        "April": {
-            "products": {
-                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
-                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
-            }
-        },
-        "Mei": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juni": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 13000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 3000},
-                "ProductD": {"sales": 140, "revenue": 19000, "expenses": 4000},
-                "ProductE": {"sales": 170, "revenue": 11000, "expenses": 9500}
-            }
-        },
-        "Juli": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 13000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 17000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 18000, "expenses": 8500}
-            }
-        },
-        "Agustus": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8900}
-            }
-        },
-        "September": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 130, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 120, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 180, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Oktober": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 130, "revenue": 14000, "expenses": 8500}
-            }
-        },
-        "November": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 90, "revenue": 19000, "expenses": 10500},
-                "ProductC": {"sales": 160, "revenue": 13000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 150, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Desember": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 4500},
-                "ProductC": {"sales": 160, "revenue": 17000, "expenses": 8000},
-                "ProductD": {"sales": 10, "revenue": 1400, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        }
-    },
-    "2023": {
-        "Januari": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 50, "revenue": 15000, "expenses": 7000},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Februari": {
-            "products": {
-                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductB": {"sales": 160, "revenue": 13000, "expenses": 8000},
-                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductD": {"sales": 110, "revenue": 14000, "expenses": 5500},
-                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
-            }
-        },
-        "March": {
-            "products": {
-                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
-                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
-            }
-        },
-        "April": {
-            "products": {
-                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
-                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
-            }
-        },
-        "Mei": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juni": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juli": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Agustus": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "September": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
-            }
-        },
-        "Oktober": {
-            "products": {
-                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
-                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
-            }
-        },
-        "November": {
-            "products": {
-                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "December": {
-            "products": {
-                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
-            }
-        }
-    },
-    "2022": {
-        "Januari": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Februari": {
-            "products": {
-                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
-            }
-        },
-        "Maret": {
-            "products": {
-                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
-                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
-            }
-        },
-        "April": {
-            "products": {
-                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
-                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
-            }
-        },
-        "Mei": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juni": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juli": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Agustus": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "September": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
-            }
-        },
-        "Oktober": {
-            "products": {
-                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
-                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
-            }
-        },
-        "November": {
-            "products": {
-                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Desember": {
-            "products": {
-                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
-            }
-        }
-    },
-    "2021": {
-        "Januari": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Februari": {
-            "products": {
-                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
-            }
-        },
-        "Maret": {
-            "products": {
-                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
-                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
-            }
-        },
-        "April": {
-            "products": {
-                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
-                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
-            }
-        },
-        "Mei": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juni": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Juli": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "Agustus": {
-            "products": {
-                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
-                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
-                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
-            }
-        },
-        "September": {
-            "products": {
-                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
-                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
-            }
-        },
-        "Oktober": {
-            "products": {
-                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
-                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
-            }
-        },
-        "November": {
-            "products": {
-                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
-                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
-                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
-                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
-            }
-        },
-        "Desember": {
-            "products": {
-                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
-                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
-                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
-                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
-                "ProductE": {"sales": 100, "revenue": 12000, "expenses": 6000}
-            }
-        }
+# Binary sales data file, memory-mapped at startup
+DATA_PATH = os.environ.get(
+    "SALES_DATA_PATH", os.path.join(os.path.dirname(__file__), "sales.bin")
+)
+
+
+def load_store(path=DATA_PATH):
+    """
+    Open the sales data file, seeding it from the bundled dummy data on first run.
+    """
+    if not os.path.exists(path):
+        from refactor.sales_seed import data
+        SalesStore.from_nested(data).save(path)
+    return SalesStore.open(path)
+
+
+store = load_store()
+
+# Seconds clients and proxies may reuse a response before revalidating it
+CACHE_MAX_AGE = int(os.environ.get("SALES_CACHE_MAX_AGE", "0"))
+
+# Serialized (and pre-compressed) response bodies keyed by endpoint and query
+response_cache = ResponseCache(int(os.environ.get("SALES_RESPONSE_CACHE_SIZE", "512")))
+
+# Request metrics, served in the Prometheus text format at /metrics. Workers
+# sharing the data file also share this directory, so a scrape of any one of
+# them reports the totals of all
+METRICS_DIR = os.environ.get("SALES_METRICS_DIR", f"{DATA_PATH}.metrics")
+metrics = MetricsRegistry(METRICS_DIR)
+request_count = metrics.counter(
+    "sales_api_requests_total", "Requests handled, by route, method and status.",
+    ("route", "method", "status"),
+)
+request_latency = metrics.histogram(
+    "sales_api_request_duration_seconds", "Time spent handling a request.",
+    ("route", "method"),
+)
+response_size = metrics.histogram(
+    "sales_api_response_size_bytes", "Size of the response body sent.",
+    ("route", "method"), buckets=SIZE_BUCKETS,
+)
+error_count = metrics.counter(
+    "sales_api_errors_total",
+    "4xx and 5xx responses, by what was rejected (year, month, product, group_by, metric, record or other).",
+    ("route", "method", "status", "reason"),
+)
+metrics.gauge(
+    "sales_api_response_cache_hits_total", "Response cache lookups served from the cache.",
+    lambda: response_cache.hits, kind="counter",
+)
+metrics.gauge(
+    "sales_api_response_cache_misses_total", "Response cache lookups that had to build the body.",
+    lambda: response_cache.misses, kind="counter",
+)
+metrics.gauge(
+    "sales_api_response_cache_hit_ratio", "Share of response cache lookups served from the cache.",
+    lambda: response_cache.hits / max(response_cache.hits + response_cache.misses, 1),
+)
+metrics.gauge(
+    "sales_api_response_cache_entries", "Response bodies currently cached.",
+    lambda: len(response_cache),
+)
+
+
+@app.before_request
+def _start_timer():
+    metrics.start()
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def _refresh_store():
+    """
+    Pick up writes made by other workers sharing the data file.
+    """
+    store.refresh()
+
+
+@app.after_request
+def _record_metrics(response):
+    """
+    Count the request and observe its latency and body size.
+
+    Routes are labelled by their URL rule, not the raw path, so query
+    strings and misspelt URLs cannot blow up the number of series.
+    """
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    started = g.get("request_started")
+    if started is not None:
+        request_latency.observe(time.perf_counter() - started, route=route, method=request.method)
+    response_size.observe(
+        response.calculate_content_length() or 0, route=route, method=request.method
+    )
+    request_count.inc(route=route, method=request.method, status=response.status_code)
+    if response.status_code >= 400:
+        error_count.inc(
+            route=route, method=request.method, status=response.status_code,
+            reason=g.get("error_reason", "other"),
+        )
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Expose request counts, latency and size histograms, errors and cache
+    hit ratios in the Prometheus text exposition format, summed over all
+    workers sharing METRICS_DIR.
+    """
+    return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
+
+
+def _json_with_validators(stamp, build):
+    """
+    Serve `build()` as JSON with ETag and Last-Modified validators derived
+    from the data's modification stamp, or a bodyless 304 when the client's
+    copy is still current.
+
+    The serialized body and its compressed variants are cached per endpoint
+    and query string until the stamp changes, and the variant is picked
+    from the request's Accept-Encoding. A 304 is decided from the
+    validators alone, without touching the cache or calling `build()`.
+    """
+    last_modified = datetime.fromtimestamp(stamp / 1_000_000, tz=timezone.utc)
+
+    # Each content coding is a different representation, so it gets its own ETag
+    etags = {
+        encoding: f"{stamp:x}" if encoding == "identity" else f"{stamp:x}-{encoding}"
+        for encoding in ("identity", "gzip", "br")
     }
-}
+
+    etag = None
+    if request.if_none_match:
+        etag = next(
+            (tag for tag in etags.values() if request.if_none_match.contains_weak(tag)), None
+        )
+        modified = etag is None
+    else:
+        # Which coding a 200 would use depends on the body, so this 304 carries no ETag
+        modified = is_resource_modified(request.environ, last_modified=last_modified)
+
+    if modified:
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        variants = response_cache.get(key, stamp)
+        if variants is None:
+            variants = response_cache.put(key, stamp, app.json.response(build()).get_data())
+
+        encoding = request.accept_encodings.best_match(
+            [name for name in ("br", "gzip") if name in variants]
+        ) or "identity"
+        etag = etags[encoding]
+        response = app.response_class(variants[encoding], mimetype=app.json.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    else:
+        response = app.response_class(status=304)
+
+    response.vary.add("Accept-Encoding")
+    if etag is not None:
+        response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = CACHE_MAX_AGE
+    response.cache_control.must_revalidate = True
+    return response
+
+def _abort(status, reason, description):
+    """
+    Abort the request, labelling its error metrics with what was rejected.
+    """
+    g.error_reason = reason
+    abort(status, description=description)
 
 
 @app.route('/api/sales_revenue', methods=['GET'])
@@ -458,30 +195,32 @@ def get_sales_revenue():
 
     # Validate the required parameter 'year'
     if not year:
-        abort(400, description="Year parameter is required")
+        _abort(400, "year", "Year parameter is required")
 
-    year_data = data.get(year)
-    if not year_data:
-        abort(404, description="Data not found for the specified year")
+    y = store.year_slot(year)
+    if y is None:
+        _abort(404, "year", "Data not found for the specified year")
 
     # If month is specified, filter by month
     if month:
-        month_data = year_data.get(month)
-        if not month_data:
-            abort(404, description="Data not found for the specified month")
+        m = store.month_slot(y, month)
+        if m is None:
+            _abort(404, "month", "Data not found for the specified month")
 
         # If product is specified, filter by product
         if product:
-            product_data = month_data["products"].get(product)
-            if not product_data:
-                abort(404, description="Data not found for the specified product")
-            
-            return jsonify(product_data), 200
-        
-        return jsonify(month_data), 200
-    
+            p = store.product_slot(product)
+            if p is None or not store.present[y, m, p]:
+                _abort(404, "product", "Data not found for the specified product")
+
+            return _json_with_validators(
+                store.stamp(y, m, p), lambda: store.product_payload(y, m, p)
+            )
+
+        return _json_with_validators(store.stamp(y, m), lambda: store.month_payload(y, m))
+
     # Return the entire year data if no month is specified
-    return jsonify(year_data), 200
+    return _json_with_validators(store.stamp(y), lambda: store.year_payload(y))
 
 @app.route('/api/sales_summary', methods=['GET'])
 def get_sales_summary():
@@ -493,52 +232,22 @@ def get_sales_summary():
 
     # Validate the required parameter 'year'
     if not year:
-        abort(400, description="Year parameter is required")
+        _abort(400, "year", "Year parameter is required")
 
-    year_data = data.get(year)
-    if not year_data:
-        abort(404, description="Data not found for the specified year")
+    y = store.year_slot(year)
+    if y is None:
+        _abort(404, "year", "Data not found for the specified year")
 
-    # If month is specified, filter by month
+    # If month is specified, use the precomputed month totals
     if month:
-        month_data = year_data.get(month)
-        if not month_data:
-            abort(404, description="Data not found for the specified month")
-
-        # Calculate totals for the month
-        total_sales = sum(p['sales'] for p in month_data["products"].values())
-        total_revenue = sum(p['revenue'] for p in month_data["products"].values())
-        total_expenses = sum(p['expenses'] for p in month_data["products"].values())
-
-        summary = {
-            "total_sales": total_sales,
-            "total_revenue": total_revenue,
-            "total_expenses": total_expenses
-        }
-
-        return jsonify(summary), 200
-    
-    # Calculate totals for the entire year if no month is specified
-    total_sales = sum(
-        sum(p['sales'] for p in month_data["products"].values())
-        for month_data in year_data.values()
-    )
-    total_revenue = sum(
-        sum(p['revenue'] for p in month_data["products"].values())
-        for month_data in year_data.values()
-    )
-    total_expenses = sum(
-        sum(p['expenses'] for p in month_data["products"].values())
-        for month_data in year_data.values()
-    )
+        m = store.month_slot(y, month)
+        if m is None:
+            _abort(404, "month", "Data not found for the specified month")
 
-    summary = {
-        "total_sales": total_sales,
-        "total_revenue": total_revenue,
-        "total_expenses": total_expenses
-    }
+        return _json_with_validators(store.stamp(y, m), lambda: store.totals(y, m))
 
-    return jsonify(summary), 200
+    # Use the precomputed year totals if no month is specified
+    return _json_with_validators(store.stamp(y), lambda: store.totals(y))
 
 @app.route('/api/sales_yearly', methods=['GET'])
 def get_sales_yearly():
@@ -549,34 +258,221 @@ def get_sales_yearly():
 
     # Validate the required parameter 'year'
     if not year:
-        abort(400, description="Year parameter is required")
+        _abort(400, "year", "Year parameter is required")
 
-    year_data = data.get(year)
-    if not year_data:
-        abort(404, description="Data not found for the specified year")
+    y = store.year_slot(year)
+    if y is None:
+        _abort(404, "year", "Data not found for the specified year")
 
-    # Calculate totals for the entire year
-    total_sales = sum(
-        sum(p['sales'] for p in month_data["products"].values())
-        for month_data in year_data.values()
-    )
-    total_revenue = sum(
-        sum(p['revenue'] for p in month_data["products"].values())
-        for month_data in year_data.values()
+    return _json_with_validators(store.stamp(y), lambda: {"year": year, **store.totals(y)})
+
+@app.route('/api/version', methods=['GET'])
+def get_data_version():
+    """
+    Retrieve the current data version, which changes on every write.
+
+    Clients holding answers derived from the sales data compare it to
+    decide whether those answers are still valid.
+    """
+    stamp = store.data_stamp()
+    return _json_with_validators(stamp, lambda: {"version": f"{stamp:x}"})
+
+
+def _split(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+def _parse_months(value):
+    """
+    Parse "Januari,Mar", "4-6", "Apr-Jun" or "Q2" style month lists into slots.
+    """
+    if not value:
+        return list(range(MONTHS_PER_YEAR))
+
+    slots = []
+    for item in _split(value):
+        if item.upper() in ("Q1", "Q2", "Q3", "Q4"):
+            start = (int(item[1]) - 1) * 3
+            slots.extend(range(start, start + 3))
+            continue
+
+        bounds = item.split("-")
+        if len(bounds) > 2:
+            _abort(400, "month", f"Invalid month range '{item}'")
+        ends = [normalize_month(bound) for bound in bounds]
+        if None in ends:
+            _abort(400, "month", f"Unknown month '{item}'")
+        if ends[0] > ends[-1]:
+            _abort(400, "month", f"Month range '{item}' runs backwards")
+        slots.extend(range(ends[0], ends[-1] + 1))
+
+    return sorted(set(slots))
+
+@app.route('/api/sales_query', methods=['GET'])
+def query_sales():
+    """
+    Aggregate sales, revenue, and expenses over several years, months, and products in one call.
+    """
+    years = _split(request.args.get('years') or request.args.get('year'))
+    products = _split(request.args.get('products') or request.args.get('product'))
+    group_by = _split(request.args.get('group_by'))
+
+    # Validate the required parameter 'years'
+    if not years:
+        _abort(400, "year", "Years parameter is required")
+
+    for dim in group_by:
+        if dim not in DIMENSIONS:
+            _abort(400, "group_by", f"Cannot group by '{dim}'")
+
+    year_slots = []
+    for year in years:
+        y = store.year_slot(year)
+        if y is None:
+            _abort(404, "year", f"Data not found for year {year}")
+        year_slots.append(y)
+
+    product_slots = []
+    for product in products:
+        p = store.product_slot(product)
+        if p is None:
+            _abort(404, "product", f"Data not found for product {product}")
+        product_slots.append(p)
+
+    year_slots = list(dict.fromkeys(year_slots))
+    month_slots = _parse_months(request.args.get('months') or request.args.get('month'))
+    product_slots = list(dict.fromkeys(product_slots)) or list(range(len(store.products)))
+
+    return _json_with_validators(
+        store.query_stamp(year_slots, month_slots),
+        lambda: {
+            "group_by": group_by,
+            "rows": store.query(year_slots, month_slots, product_slots, group_by),
+        },
     )
-    total_expenses = sum(
-        sum(p['expenses'] for p in month_data["products"].values())
-        for month_data in year_data.values()
+
+@app.route('/api/sales_stats', methods=['GET'])
+def get_sales_stats():
+    """
+    Retrieve highest and lowest products, ranges, percentiles, and month-over-month changes.
+    """
+    year = request.args.get('year')
+    month = request.args.get('month')
+    metric = request.args.get('metric')
+
+    # Validate the required parameter 'year'
+    if not year:
+        _abort(400, "year", "Year parameter is required")
+    if metric and metric not in METRICS:
+        _abort(400, "metric", f"Metric must be one of {', '.join(METRICS)}")
+
+    y = store.year_slot(year)
+    if y is None:
+        _abort(404, "year", "Data not found for the specified year")
+
+    m = None
+    if month:
+        m = store.month_slot(y, month)
+        if m is None:
+            _abort(404, "month", "Data not found for the specified month")
+
+    return _json_with_validators(
+        store.stats_stamp(y, m), lambda: _select_metric(store.stats(y, m), metric)
     )
 
-    summary = {
-        "year": year,
-        "total_sales": total_sales,
-        "total_revenue": total_revenue,
-        "total_expenses": total_expenses
-    }
+def _select_metric(stats, metric):
+    """
+    Narrow a statistics result to a single metric when one is asked for.
+    """
+    if not metric:
+        return stats
+
+    stats = dict(stats)
+    stats["metrics"] = {k: v for k, v in stats["metrics"].items() if k == metric}
+    if "month_over_month" in stats:
+        stats["month_over_month"] = {
+            product: {metric: deltas[metric]}
+            for product, deltas in stats["month_over_month"].items()
+        }
+    return stats
+
+def _parse_record(payload, require_metrics):
+    """
+    Validate a year/month/product record from a request body.
+    """
+    if not isinstance(payload, dict):
+        _abort(400, "record", "Record must be a JSON object")
+
+    record = {}
+    for key in ("year", "month", "product"):
+        value = payload.get(key)
+        if not value or not isinstance(value, str):
+            _abort(400, key, f"'{key}' must be a non-empty string")
+        record[key] = value
+
+    if normalize_month(record["month"]) is None:
+        _abort(400, "month", f"Unknown month {record['month']!r}")
+
+    for metric in METRICS:
+        if metric not in payload:
+            if require_metrics:
+                _abort(400, "metric", f"'{metric}' is required")
+            continue
+        value = payload[metric]
+        if not isinstance(value, int) or isinstance(value, bool):
+            _abort(400, "metric", f"'{metric}' must be an integer")
+        record[metric] = value
+
+    return record
+
+@app.route('/api/sales_revenue', methods=['POST'])
+def create_sales_record():
+    """
+    Create or replace the sales, revenue, and expenses record for a year, month, and product.
+    """
+    record = _parse_record(request.get_json(silent=True), require_metrics=True)
+    try:
+        created = store.upsert(record["year"], record["month"], record["product"], record)
+    except ValueError as e:
+        _abort(400, "metric", str(e))
+
+    return jsonify(record), 201 if created else 200
+
+@app.route('/api/sales_revenue', methods=['PATCH'])
+def update_sales_record():
+    """
+    Update some metrics of an existing year, month, and product record.
+    """
+    record = _parse_record(request.get_json(silent=True), require_metrics=False)
+    try:
+        store.upsert(record["year"], record["month"], record["product"], record, create=False)
+    except KeyError:
+        _abort(404, "record", "Data not found for the specified record")
+    except ValueError as e:
+        _abort(400, "metric", str(e))
+
+    y = store.year_slot(record["year"])
+    m = store.month_slot(y, record["month"])
+    p = store.product_slot(record["product"])
+    return jsonify(store.product_payload(y, m, p)), 200
+
+@app.route('/api/sales_revenue/bulk', methods=['POST'])
+def bulk_upsert_sales_records():
+    """
+    Create or update many records at once; metrics left out keep their current value.
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("records")
+    if not isinstance(payload, list):
+        _abort(400, "record", "Body must be a list of records or {\"records\": [...]}")
+
+    records = [_parse_record(item, require_metrics=False) for item in payload]
+    try:
+        created = store.upsert_many(records)
+    except ValueError as e:
+        _abort(400, "metric", str(e))
 
-    return jsonify(summary), 200
+    return jsonify({"upserted": len(records), "created": created}), 200
 
 
 @app.errorhandler(400)
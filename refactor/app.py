@@ -1,52 +1,71 @@
+import uuid
+import openai
 import streamlit as st
 from refactor.assistant import AssistantManager
+from refactor.polling import RunFailedError
+from refactor.run_steps import run_steps_panel
+from refactor.timing_panel import timing_panel
+
+# Streamlit re-runs this script on every interaction; build the client once per process
+@st.cache_resource
+def get_client():
+    return openai.OpenAI()
+
+@st.cache_resource
+def get_assistant(assistant_id):
+    return get_client().beta.assistants.retrieve(assistant_id=assistant_id)
 
 def main():
-    manager = AssistantManager(model="gpt-3.5-turbo-16k")
+    # Each browser session gets its own thread through the registry
+    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    # Keep the manager across reruns so its resolved assistant and thread are reused
+    if "manager" not in st.session_state:
+        st.session_state.manager = AssistantManager(
+            model="gpt-3.5-turbo-16k",
+            session_id=session_id,
+            client=get_client(),
+            assistant_loader=get_assistant,
+        )
+    manager = st.session_state.manager
     
     st.title("News Summarizer")
     
     with st.form(key="user_input_form"):
         instructions = st.text_input("Enter topic:")
+        stream_response = st.checkbox("Stream response", value=True)
         submit_button = st.form_submit_button(label="Run Assistant")
         
         if submit_button:
-            manager.create_assistant(
-                name="News Summarizer",
-                instructions="You are a personal article summarizer assistant who knows how to take a list of articles' titles and descriptions and then write a short summary of all the news articles.",
-                tools=[{
-                    "type": "function",
-                    "function": {
-                        "name": "get_news",
-                        "description": "Get the list of articles/news for the given topic",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "topic": {
-                                    "type": "string",
-                                    "description": "The topic for the news, e.g., Tesla",
-                                }
-                            },
-                            "required": ["topic"],
-                        },
-                    },
-                }]
-            )
-            manager.create_thread()
-            
-            manager.add_message_to_thread(
-                role="user",
-                content=f"Summarize the news on this topic: {instructions}?"
-            )
-            manager.run_assistant(instructions="Summarize the news")
+            # Everything below becomes one trace, shown in the timing panel
+            with manager.tracer.span("request", session_id=session_id) as request_span:
+                st.session_state.trace_id = request_span.trace_id
+                manager.create_assistant(
+                    name="News Summarizer",
+                    instructions="You are a personal article summarizer assistant who knows how to take a list of articles' titles and descriptions and then write a short summary of all the news articles.",
+                    tools=manager.tools.schemas(),
+                )
+                manager.create_thread()
             
-            manager.wait_for_completion()
-            
-            summary = manager.get_summary()
-            st.write(summary)
-            
-            st.text("Run Steps:")
-            st.code(manager.run_steps(), line_numbers=True)
+                manager.add_message_to_thread(
+                    role="user",
+                    content=f"Summarize the news on this topic: {instructions}?"
+                )
+                try:
+                    if stream_response:
+                        # Render the answer token by token as the run produces it
+                        st.write_stream(manager.stream_assistant(instructions="Summarize the news"))
+                    else:
+                        manager.run_assistant(instructions="Summarize the news")
+                        manager.wait_for_completion()
+                    
+                        summary = manager.get_summary()
+                        st.write(summary)
+                except (RunFailedError, TimeoutError) as e:
+                    st.error(str(e))
+
+    # Run steps and timings are only fetched when their panels are switched on
+    run_steps_panel(manager)
+    timing_panel(manager.tracer, st.session_state.get("trace_id"))
 
 if __name__ == "__main__":
     main()
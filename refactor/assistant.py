@@ -1,127 +1,364 @@
 import openai
 import os
-import time
 import json
+import logging
 import requests
 from dotenv import load_dotenv
+from refactor import sales_client
+from refactor.assistant_manifest import AssistantManifest, fingerprint
+from refactor.log import LOG_SAMPLE_RATE, log_event, model_json, shorten
+from refactor.messages import run_answer
+from refactor.news import TOOL_TOKEN_BUDGETS as NEWS_TOOL_BUDGETS, tools as news_tools
+from refactor.polling import PollSchedule, RunFailedError, RUN_FAILURE_EVENTS, RUN_FAILURE_STATUSES
+from refactor.thread_registry import ThreadRegistry, get_cleanup_executor
+from refactor.tool_cache import ToolOutputCache, get_tool_cache
+from refactor.tool_output import TOOL_OUTPUT_TOKENS, shape_output
+from refactor.tool_registry import ToolArgumentError, ToolRegistry
+from refactor.tool_runner import run_tool_calls
+from refactor.tracing import Tracer, get_tracer, record_run_phases, run_usage
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 
 class AssistantManager:
-    thread_id = "thread_PJ6OXeGEO5e94nWw5lWBkfgX"
     assistant_id = "asst_gtpT2wBTv3KLvS4lPR8tuVbe"
 
-    def __init__(self, model: str):
-        self.client = openai.OpenAI()
+    def __init__(self, model: str, session_id: str = None, registry: ThreadRegistry = None,
+                 poll_schedule: PollSchedule = None, client: openai.OpenAI = None,
+                 assistant_loader=None, manifest: AssistantManifest = None,
+                 tools: ToolRegistry = None, tracer: Tracer = None,
+                 tool_cache: ToolOutputCache = None, tool_budgets: dict = None):
+        self.client = client or openai.OpenAI()
         self.model = model
-        self.assistant = None
-        self.thread = None
+        self.tools = tools or news_tools
+        # Token budget per tool name; tools not listed get TOOL_OUTPUT_TOKENS
+        self.tool_budgets = tool_budgets if tool_budgets is not None else NEWS_TOOL_BUDGETS
+        self.assistant_loader = assistant_loader or self.retrieve_assistant
+        self.manifest = manifest or AssistantManifest()
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_cache()
+        self.tracer = tracer or get_tracer()
+        self.session_id = session_id
+        self.registry = registry or (ThreadRegistry() if session_id else None)
+        self.poll_schedule = poll_schedule or PollSchedule.from_env()
         self.run = None
         self.summary = None
+        # Time spent running tools locally in the current run, kept out of its model time
+        self._tool_seconds = 0.0
+        # Sales data version the current batch of tool calls is cached under
+        self._data_version = None
 
-        # Retrieve existing assistant and thread if IDs are already set
-        if AssistantManager.assistant_id:
-            self.assistant = self.client.beta.assistants.retrieve(
-                assistant_id=AssistantManager.assistant_id
-            )
-        if AssistantManager.thread_id:
-            self.thread = self.client.beta.threads.retrieve(
-                thread_id=AssistantManager.thread_id
-            )
+        # Only remember the IDs here; the objects are retrieved on first use
+        self._assistant = None
+        self._assistant_id = type(self).assistant_id
+        self._fingerprint = None
+        self._thread = None
+        self._thread_id = self.registry.current(session_id) if session_id else None
+        # Turns already in the thread; answers there may depend on them
+        self._turns = self.registry.runs(self._thread_id) if self._thread_id else 0
+
+    @property
+    def assistant(self):
+        # Resolved on first use, so constructing a manager costs no network I/O
+        if self._assistant is None and self._assistant_id:
+            self._assistant = self.assistant_loader(self._assistant_id)
+        return self._assistant
+
+    @assistant.setter
+    def assistant(self, assistant):
+        self._assistant = assistant
+        self._assistant_id = assistant.id if assistant else None
+
+    @property
+    def thread(self):
+        if self._thread is None and self._thread_id:
+            try:
+                self._thread = self.client.beta.threads.retrieve(thread_id=self._thread_id)
+            except openai.NotFoundError:
+                self._thread_id = None
+        return self._thread
+
+    @thread.setter
+    def thread(self, thread):
+        self._thread = thread
+        self._thread_id = thread.id if thread else None
+
+    def retrieve_assistant(self, assistant_id):
+        return self.client.beta.assistants.retrieve(assistant_id=assistant_id)
 
     def create_assistant(self, name, instructions, tools):
+        # Reuse the assistant recorded in the manifest, updating it in place when
+        # its definition changed; a new one is only created when none is known
+        digest = fingerprint(name, instructions, tools, self.model)
+        if digest == self._fingerprint:
+            return
+
+        entry = self.manifest.get(name)
+        assistant_id = entry["assistant_id"] if entry else self._assistant_id
+        if assistant_id:
+            try:
+                if entry and entry["fingerprint"] == digest:
+                    self.assistant = self.assistant_loader(assistant_id)
+                else:
+                    self.assistant = self.client.beta.assistants.update(
+                        assistant_id=assistant_id,
+                        name=name,
+                        instructions=instructions,
+                        tools=tools,
+                        model=self.model,
+                    )
+            except openai.NotFoundError:
+                self.assistant = None  # deleted on the OpenAI side
         if not self.assistant:
-            assistant_obj = self.client.beta.assistants.create(
+            self.assistant = self.client.beta.assistants.create(
                 name=name,
                 instructions=instructions,
                 tools=tools,
                 model=self.model,
             )
-            AssistantManager.assistant_id = assistant_obj.id
-            self.assistant = assistant_obj
+
+        type(self).assistant_id = self.assistant.id
+        if entry != {"assistant_id": self.assistant.id, "fingerprint": digest}:
+            self.manifest.record(name, self.assistant.id, digest)
+        self._fingerprint = digest
+        log_event(logger, logging.INFO, "assistant.ready", assistant_id=self.assistant.id)
 
     def create_thread(self):
+        # Start over when the registry has retired the session's thread
+        if self._thread_id and self.session_id and self.registry.current(self.session_id) != self._thread_id:
+            self.thread = None
         if not self.thread:
             thread_obj = self.client.beta.threads.create()
-            AssistantManager.thread_id = thread_obj.id
             self.thread = thread_obj
+            self._turns = 0
+            log_event(logger, logging.INFO, "thread.created", thread_id=self.thread.id)
+            if self.session_id:
+                self.registry.assign(self.session_id, thread_obj.id)
+                # Delete retired threads off the request path, away from the tool-call pool
+                get_cleanup_executor().submit(self.registry.cleanup, self.delete_thread)
+
+    def delete_thread(self, thread_id):
+        self.client.beta.threads.delete(thread_id=thread_id)
 
     def add_message_to_thread(self, role, content):
         if self.thread:
-            self.client.beta.threads.messages.create(
-                thread_id=self.thread.id,
-                role=role,
-                content=content
-            )
+            with self.tracer.span("message.create", thread_id=self.thread.id):
+                self.client.beta.threads.messages.create(
+                    thread_id=self.thread.id,
+                    role=role,
+                    content=content
+                )
+
+    def has_history(self):
+        """
+        Return True when the current thread already holds earlier turns.
+        """
+        return self._turns > 0
+
+    def record_answered_turn(self, content, answer):
+        """
+        Add a question answered without a run, and its answer, to the thread,
+        so later turns in the session still see them.
+        """
+        if self.thread:
+            self.add_message_to_thread("user", content)
+            self.add_message_to_thread("assistant", answer)
+            self._turns += 1
+            if self.session_id:
+                self.registry.record_run(self.thread.id)
 
     def run_assistant(self, instructions):
         if self.thread and self.assistant:
-            self.run = self.client.beta.threads.runs.create(
+            with self.tracer.span("run.create", thread_id=self.thread.id) as span:
+                self.run = self.client.beta.threads.runs.create(
+                    thread_id=self.thread.id,
+                    assistant_id=self.assistant.id,
+                    instructions=instructions,
+                )
+                span.set(run_id=self.run.id)
+            self._tool_seconds = 0.0
+            self._turns += 1
+            if self.session_id:
+                self.registry.record_run(self.thread.id)
+
+    def stream_assistant(self, instructions):
+        """
+        Run the assistant on the event stream, yielding text deltas as they arrive.
+
+        Tool calls are answered inline and the run continues on the stream
+        returned by submit_tool_outputs_stream. The full answer is kept as
+        the summary once the run ends.
+        """
+        if not (self.thread and self.assistant):
+            return
+
+        self._turns += 1
+        if self.session_id:
+            self.registry.record_run(self.thread.id)
+
+        # A generator can't hold the current span across yields; nest under it explicitly
+        span = self.tracer.start("run.stream", thread_id=self.thread.id)
+        self._tool_seconds = 0.0
+        parts = []
+        try:
+            stream = self.client.beta.threads.runs.stream(
                 thread_id=self.thread.id,
                 assistant_id=self.assistant.id,
                 instructions=instructions,
             )
+            while stream is not None:
+                with stream as events:
+                    stream = None
+                    for event in events:
+                        if event.event == "thread.run.created":
+                            self.run = event.data
+                            span.set(run_id=self.run.id)
+                        elif event.event == "thread.message.delta":
+                            for block in event.data.delta.content or []:
+                                if block.type == "text" and block.text and block.text.value:
+                                    if not parts:
+                                        span.set(first_token_ms=round(span.duration_ms, 1))
+                                    parts.append(block.text.value)
+                                    yield block.text.value
+                        elif event.event == "thread.run.requires_action":
+                            self.run = event.data
+                            tool_outputs = self._run_tools(
+                                event.data.required_action.submit_tool_outputs.model_dump(), span
+                            )
+                            stream = self.client.beta.threads.runs.submit_tool_outputs_stream(
+                                thread_id=self.thread.id,
+                                run_id=self.run.id,
+                                tool_outputs=tool_outputs,
+                            )
+                        elif event.event == "thread.run.completed":
+                            self.run = event.data
+                            self._trace_run_end(event.data, span)
+                        elif event.event in RUN_FAILURE_EVENTS:
+                            self.run = event.data
+                            self._trace_run_end(event.data, span)
+                            raise RunFailedError(event.data)
+        except Exception as e:
+            span.fail(e)
+            raise
+        finally:
+            span.end()
+
+        self.summary = "".join(parts)
 
     def process_message(self):
-        if self.thread:
-            messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread.id
-            )
-            summary = []
+        if self.thread and self.run:
+            # Only this run's messages, with every text part, not the thread's newest page
+            with self.tracer.span("message.fetch", run_id=self.run.id):
+                self.summary = run_answer(self.client, self.thread.id, self.run.id)
+            log_event(logger, logging.DEBUG, "run.answer", run_id=self.run.id,
+                      chars=len(self.summary), text=shorten(self.summary))
+
+    def execute_tool_call(self, action):
+        func_name = action["function"]["name"]
+        arguments = json.loads(action["function"]["arguments"])
+
+        with self.tracer.span("tool", tool=func_name) as span:
+            # Repeated calls on unchanged data are answered from the tool-output cache
+            output = self.tool_cache.get(func_name, arguments, self._data_version)
+            span.set(cache_hit=output is not None)
+            if output is None:
+                try:
+                    result = self.tools.call(func_name, arguments)
+                except ToolArgumentError as e:
+                    # Report bad arguments back so the model can correct its call
+                    return {"tool_call_id": action["id"], "output": f"Error: {e}"}
+                log_event(logger, logging.DEBUG, "tool.output", tool=func_name, output=shorten(result))
+                # The fetchers report failures as strings; those are passed on as is and not cached
+                if isinstance(result, str):
+                    output = result
+                else:
+                    output = shape_output(result, self.tool_budgets.get(func_name, TOOL_OUTPUT_TOKENS))
+                    self.tool_cache.put(func_name, arguments, output, self._data_version)
 
-            last_message = messages.data[0]
-            response = last_message.content[0].text.value
-            summary.append(response)
+        return {"tool_call_id": action["id"], "output": output}
 
-            self.summary = "\n".join(summary)
+    def _run_tools(self, required_actions, parent=None):
+        # One version check per batch; outputs cached under an older version are not reused
+        self._data_version = sales_client.data_version()
+        # Independent tool calls run concurrently; outputs keep the call order
+        with self.tracer.span("tool_calls", parent=parent, run_id=self.run.id,
+                              calls=len(required_actions["tool_calls"])) as span:
+            tool_outputs = run_tool_calls(required_actions["tool_calls"], self.execute_tool_call)
+        self._tool_seconds += span.duration_ms / 1000
+        return tool_outputs
+
+    def _trace_run_end(self, run, span):
+        # Token usage and the queue/model split are only known once the run has ended
+        span.set(status=run.status, **run_usage(run))
+        record_run_phases(self.tracer, run, self._tool_seconds, parent=span)
 
     def call_required_functions(self, required_actions):
         if not self.run:
             return
-        tool_outputs = []
-
-        for action in required_actions["tool_calls"]:
-            func_name = action["function"]["name"]
-            arguments = json.loads(action["function"]["arguments"])
-
-            if func_name == "get_news":
-                from refactor.news import get_news  # Import the function
-                output = get_news(topic=arguments["topic"])
-                final_str = "".join(output)
 
-                tool_outputs.append({"tool_call_id": action["id"], "output": final_str})
-            else:
-                raise ValueError(f"Unknown Function: {func_name}")
+        tool_outputs = self._run_tools(required_actions)
 
-        self.client.beta.threads.runs.submit_tool_outputs(
-            thread_id=self.thread.id,
-            run_id=self.run.id,
-            tool_outputs=tool_outputs
-        )
+        log_event(logger, logging.INFO, "tool.submit", run_id=self.run.id, outputs=len(tool_outputs))
+        with self.tracer.span("tool_outputs.submit", run_id=self.run.id):
+            self.client.beta.threads.runs.submit_tool_outputs(
+                thread_id=self.thread.id,
+                run_id=self.run.id,
+                tool_outputs=tool_outputs
+            )
 
     def get_summary(self):
         return self.summary
 
     def wait_for_completion(self):
         if self.thread and self.run:
-            while True:
-                time.sleep(5)
-                run_status = self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread.id,
-                    run_id=self.run.id
-                )
+            with self.tracer.span("run.wait", run_id=self.run.id) as span:
+                poll = self.poll_schedule.start()
+                while poll.wait():
+                    # Each poll's span is the request overhead; the sleeps between them are not
+                    with self.tracer.span("run.poll", run_id=self.run.id) as poll_span:
+                        run_status = self.client.beta.threads.runs.retrieve(
+                            thread_id=self.thread.id,
+                            run_id=self.run.id
+                        )
+                        poll_span.set(status=run_status.status)
+                    # One record per poll adds up; sample it and only serialize the run if it is emitted
+                    log_event(logger, logging.DEBUG, "run.poll", sample_rate=LOG_SAMPLE_RATE,
+                              run_id=run_status.id, status=run_status.status, run=model_json(run_status))
 
-                if run_status.status == "completed":
-                    self.process_message()
-                    break
-                elif run_status.status == "requires_action":
-                    self.call_required_functions(
-                        required_actions=run_status.required_action.submit_tool_outputs.model_dump()
-                    )
+                    if run_status.status == "completed":
+                        self._trace_run_end(run_status, span)
+                        self.process_message()
+                        return
+                    elif run_status.status == "requires_action":
+                        log_event(logger, logging.INFO, "run.requires_action", run_id=run_status.id)
+                        self.call_required_functions(
+                            required_actions=run_status.required_action.submit_tool_outputs.model_dump()
+                        )
+                        # The model picks up again after the tool outputs, so poll fast again
+                        poll.reset()
+                    elif run_status.status in RUN_FAILURE_STATUSES:
+                        self._trace_run_end(run_status, span)
+                        raise RunFailedError(run_status)
 
-    def run_steps(self):
-        run_steps = self.client.beta.threads.runs.steps.list(
+                # The run may have ended since the last poll, and then the cancel is rejected
+                try:
+                    self.client.beta.threads.runs.cancel(thread_id=self.thread.id, run_id=self.run.id)
+                except openai.OpenAIError as e:
+                    log_event(logger, logging.WARNING, "run.cancel_failed",
+                              run_id=self.run.id, error=repr(e))
+                raise TimeoutError(
+                    f"Run {self.run.id} did not finish within {self.poll_schedule.deadline:g}s"
+                )
+
+    def run_steps(self, limit=20, after=None):
+        """
+        Return one page of the last run's steps, oldest first, and the cursor
+        for the next page (None after the last page).
+        """
+        page = self.client.beta.threads.runs.steps.list(
             thread_id=self.thread.id,
-            run_id=self.run.id
+            run_id=self.run.id,
+            order="asc",
+            limit=limit,
+            after=after or openai.NOT_GIVEN,
         )
-        return run_steps.data
+        return page.data, page.data[-1].id if page.has_more and page.data else None
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import threading
+
+ASSISTANT_MANIFEST_PATH = os.environ.get(
+    "ASSISTANT_MANIFEST_PATH", os.path.join(os.path.dirname(__file__), "assistants.json")
+)
+
+
+def fingerprint(name, instructions, tools, model):
+    """
+    Return a stable hash of everything that defines an assistant.
+    """
+    spec = {"name": name, "instructions": instructions, "tools": tools, "model": model}
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class AssistantManifest:
+    """
+    Local JSON record of provisioned assistants, keyed by assistant name.
+
+    Each entry holds the assistant ID and the fingerprint it was last
+    provisioned with, so a fresh process can reuse the assistant instead
+    of creating a new one, and update it in place when its definition
+    changes.
+    """
+
+    def __init__(self, path=ASSISTANT_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self, name):
+        with self._lock:
+            return self._load().get(name)
+
+    def record(self, name, assistant_id, digest):
+        with self._lock:
+            entries = self._load()
+            entries[name] = {"assistant_id": assistant_id, "fingerprint": digest}
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,281 @@
+import asyncio
+import json
+import logging
+
+import openai
+from dotenv import load_dotenv
+
+from refactor import sales_client
+from refactor.assistant import AssistantManager
+from refactor.assistant_manifest import AssistantManifest, fingerprint
+from refactor.log import log_event
+from refactor.messages import message_text, run_messages_async
+from refactor.news import TOOL_TOKEN_BUDGETS as NEWS_TOOL_BUDGETS, async_tools
+from refactor.polling import PollSchedule, RunFailedError, RUN_FAILURE_STATUSES
+from refactor.thread_registry import ThreadRegistry
+from refactor.tool_cache import ToolOutputCache, get_tool_cache
+from refactor.tool_output import TOOL_OUTPUT_TOKENS, shape_output
+from refactor.tool_registry import ToolArgumentError, ToolRegistry
+from refactor.tool_runner import MAX_TOOL_WORKERS
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+class AsyncAssistantManager:
+    """
+    asyncio counterpart of AssistantManager.
+
+    It uses the async OpenAI client, async tool fetchers and asyncio.sleep
+    between polls, so one event loop can drive many runs at once. The
+    methods mirror AssistantManager's, but are coroutines. Build instances
+    with `await AsyncAssistantManager.create(model, session_id)`, which
+    also retrieves the configured assistant and the session's thread.
+
+    The thread registry, the assistant manifest and the SQLite tier of
+    the tool cache block on disk, so they are called through
+    asyncio.to_thread rather than on the event loop.
+    """
+    assistant_id = AssistantManager.assistant_id
+
+    def __init__(self, model: str, session_id: str = None, registry: ThreadRegistry = None,
+                 poll_schedule: PollSchedule = None, manifest: AssistantManifest = None,
+                 tool_cache: ToolOutputCache = None, tools: ToolRegistry = None,
+                 tool_budgets: dict = None):
+        self.client = openai.AsyncOpenAI()
+        self.model = model
+        self.tools = tools or async_tools
+        # Token budget per tool name; tools not listed get TOOL_OUTPUT_TOKENS
+        self.tool_budgets = tool_budgets if tool_budgets is not None else NEWS_TOOL_BUDGETS
+        self.manifest = manifest or AssistantManifest()
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_cache()
+        self._fingerprint = None
+        self.session_id = session_id
+        self.registry = registry or (ThreadRegistry() if session_id else None)
+        self.poll_schedule = poll_schedule or PollSchedule.from_env()
+        self._cleanup_task = None
+        # Sales data version the current batch of tool calls is cached under
+        self._data_version = None
+        self.assistant = None
+        self.thread = None
+        self.run = None
+        self.summary = None
+
+    @classmethod
+    async def create(cls, model: str, session_id: str = None, **kwargs):
+        """
+        Build a manager (keyword arguments go to __init__) and retrieve its
+        assistant and the session's current thread.
+        """
+        if session_id and kwargs.get("registry") is None:
+            # Opening the registry creates its SQLite schema; keep that off the loop too
+            kwargs["registry"] = await asyncio.to_thread(ThreadRegistry)
+        manager = cls(model=model, session_id=session_id, **kwargs)
+
+        # Retrieve the existing assistant and the session's current thread
+        if cls.assistant_id:
+            manager.assistant = await manager.client.beta.assistants.retrieve(
+                assistant_id=cls.assistant_id
+            )
+        thread_id = await asyncio.to_thread(manager.registry.current, session_id) if session_id else None
+        if thread_id:
+            manager.thread = await manager.client.beta.threads.retrieve(
+                thread_id=thread_id
+            )
+        return manager
+
+    async def create_assistant(self, name, instructions, tools):
+        # Same manifest lookup as AssistantManager.create_assistant
+        digest = fingerprint(name, instructions, tools, self.model)
+        if digest == self._fingerprint:
+            return
+
+        entry = await asyncio.to_thread(self.manifest.get, name)
+        assistant_id = entry["assistant_id"] if entry else getattr(self.assistant, "id", None)
+        if assistant_id:
+            try:
+                if entry and entry["fingerprint"] == digest:
+                    if getattr(self.assistant, "id", None) != assistant_id:
+                        self.assistant = await self.client.beta.assistants.retrieve(
+                            assistant_id=assistant_id
+                        )
+                else:
+                    self.assistant = await self.client.beta.assistants.update(
+                        assistant_id=assistant_id,
+                        name=name,
+                        instructions=instructions,
+                        tools=tools,
+                        model=self.model,
+                    )
+            except openai.NotFoundError:
+                self.assistant = None  # deleted on the OpenAI side
+        if not self.assistant:
+            self.assistant = await self.client.beta.assistants.create(
+                name=name,
+                instructions=instructions,
+                tools=tools,
+                model=self.model,
+            )
+
+        AsyncAssistantManager.assistant_id = self.assistant.id
+        if entry != {"assistant_id": self.assistant.id, "fingerprint": digest}:
+            await asyncio.to_thread(self.manifest.record, name, self.assistant.id, digest)
+        self._fingerprint = digest
+
+    async def create_thread(self):
+        # Start over when the registry has retired the session's thread
+        if self.thread and self.session_id:
+            if await asyncio.to_thread(self.registry.current, self.session_id) != self.thread.id:
+                self.thread = None
+        if not self.thread:
+            thread_obj = await self.client.beta.threads.create()
+            self.thread = thread_obj
+            if self.session_id:
+                await asyncio.to_thread(self.registry.assign, self.session_id, thread_obj.id)
+                # Delete retired threads off the request path; failures are logged when it ends
+                self._cleanup_task = asyncio.create_task(self.cleanup_threads())
+                self._cleanup_task.add_done_callback(_log_cleanup_failure)
+
+    async def cleanup_threads(self, limit=50):
+        removed = []
+        for thread_id in await asyncio.to_thread(self.registry.retired, limit):
+            try:
+                await self.client.beta.threads.delete(thread_id=thread_id)
+            except openai.NotFoundError:
+                pass  # already gone on the OpenAI side
+            except openai.OpenAIError:
+                continue  # keep it and retry on the next cleanup
+            removed.append(thread_id)
+        await asyncio.to_thread(self.registry.forget, removed)
+
+    async def add_message_to_thread(self, role, content):
+        if self.thread:
+            await self.client.beta.threads.messages.create(
+                thread_id=self.thread.id,
+                role=role,
+                content=content
+            )
+
+    async def run_assistant(self, instructions):
+        if self.thread and self.assistant:
+            self.run = await self.client.beta.threads.runs.create(
+                thread_id=self.thread.id,
+                assistant_id=self.assistant.id,
+                instructions=instructions,
+            )
+            if self.session_id:
+                await asyncio.to_thread(self.registry.record_run, self.thread.id)
+
+    async def process_message(self):
+        if self.thread and self.run:
+            summary = []
+            async for message in run_messages_async(self.client, self.thread.id, self.run.id):
+                text = message_text(message)
+                if text:
+                    summary.append(text)
+
+            self.summary = "\n\n".join(summary)
+
+    async def _tool_cache(self, method, *args):
+        # The in-memory cache is a dict lookup; only the SQLite tier needs a worker thread
+        if self.tool_cache.path:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def execute_tool_call(self, action):
+        func_name = action["function"]["name"]
+        arguments = json.loads(action["function"]["arguments"])
+
+        output = await self._tool_cache(self.tool_cache.get, func_name, arguments, self._data_version)
+        if output is not None:
+            return {"tool_call_id": action["id"], "output": output}
+
+        try:
+            result = await self.tools.call_async(func_name, arguments)
+        except ToolArgumentError as e:
+            return {"tool_call_id": action["id"], "output": f"Error: {e}"}
+        # The fetchers report failures as strings; those are passed on as is and not cached
+        if isinstance(result, str):
+            return {"tool_call_id": action["id"], "output": result}
+
+        output = shape_output(result, self.tool_budgets.get(func_name, TOOL_OUTPUT_TOKENS))
+        await self._tool_cache(self.tool_cache.put, func_name, arguments, output, self._data_version)
+        return {"tool_call_id": action["id"], "output": output}
+
+    async def call_required_functions(self, required_actions):
+        if not self.run:
+            return
+
+        # One version check per batch; outputs cached under an older version are not reused
+        self._data_version = await sales_client.data_version_async()
+        # Independent tool calls run concurrently; gather keeps the call order
+        limit = asyncio.Semaphore(MAX_TOOL_WORKERS)
+
+        async def bounded(action):
+            async with limit:
+                return await self.execute_tool_call(action)
+
+        tool_outputs = await asyncio.gather(
+            *(bounded(action) for action in required_actions["tool_calls"])
+        )
+
+        await self.client.beta.threads.runs.submit_tool_outputs(
+            thread_id=self.thread.id,
+            run_id=self.run.id,
+            tool_outputs=list(tool_outputs)
+        )
+
+    def get_summary(self):
+        return self.summary
+
+    async def wait_for_completion(self):
+        if self.thread and self.run:
+            poll = self.poll_schedule.start()
+            while (delay := poll.next_delay()) is not None:
+                await asyncio.sleep(delay)
+                run_status = await self.client.beta.threads.runs.retrieve(
+                    thread_id=self.thread.id,
+                    run_id=self.run.id
+                )
+
+                if run_status.status == "completed":
+                    await self.process_message()
+                    return
+                elif run_status.status == "requires_action":
+                    await self.call_required_functions(
+                        required_actions=run_status.required_action.submit_tool_outputs.model_dump()
+                    )
+                    # The model picks up again after the tool outputs, so poll fast again
+                    poll.reset()
+                elif run_status.status in RUN_FAILURE_STATUSES:
+                    raise RunFailedError(run_status)
+
+            # The run may have ended since the last poll, and then the cancel is rejected
+            try:
+                await self.client.beta.threads.runs.cancel(
+                    thread_id=self.thread.id, run_id=self.run.id
+                )
+            except openai.OpenAIError as e:
+                log_event(logger, logging.WARNING, "run.cancel_failed",
+                          run_id=self.run.id, error=repr(e))
+            raise TimeoutError(
+                f"Run {self.run.id} did not finish within {self.poll_schedule.deadline:g}s"
+            )
+
+    async def run_steps(self, limit=20, after=None):
+        """
+        Return one page of the last run's steps, oldest first, and the cursor
+        for the next page (None after the last page).
+        """
+        page = await self.client.beta.threads.runs.steps.list(
+            thread_id=self.thread.id,
+            run_id=self.run.id,
+            order="asc",
+            limit=limit,
+            after=after or openai.NOT_GIVEN,
+        )
+        return page.data, page.data[-1].id if page.has_more and page.data else None
+
+
+def _log_cleanup_failure(task):
+    if not task.cancelled() and task.exception() is not None:
+        log_event(logger, logging.WARNING, "thread.cleanup_failed", error=repr(task.exception()))
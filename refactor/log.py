@@ -0,0 +1,80 @@
+import logging
+import os
+import random
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# Fraction of high-volume events (e.g. one per poll) that are logged
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.1"))
+# Longest text value (tool outputs, answers) written into a log line
+LOG_MAX_VALUE = int(os.environ.get("LOG_MAX_VALUE", "200"))
+
+
+class Lazy:
+    """
+    A log value computed only when the record is actually formatted.
+    """
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+
+def _shorten(value, limit):
+    text = str(value)
+    return text if len(text) <= limit else f"{text[:limit]}... ({len(text)} chars)"
+
+
+def shorten(value, limit=LOG_MAX_VALUE):
+    """
+    Lazily cut `value`'s text to `limit` characters.
+    """
+    return Lazy(_shorten, value, limit)
+
+
+def model_json(model):
+    """
+    Lazily serialize a Pydantic model (e.g. a run) to compact JSON.
+    """
+    return Lazy(model.model_dump_json)
+
+
+class _Fields:
+    __slots__ = ("fields",)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+
+def log_event(logger, level, event, sample_rate=None, **fields):
+    """
+    Log `event` with key=value fields.
+
+    Nothing is built when `level` is disabled for `logger`, and field
+    values (see Lazy) are only turned into text when a handler formats the
+    record. With `sample_rate`, only that fraction of calls is logged.
+    The event name and fields are also attached to the record as `event`
+    and `fields` for structured handlers.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if sample_rate is not None and random.random() >= sample_rate:
+        return
+    logger.log(level, "%s %s", event, _Fields(fields), extra={"event": event, "fields": fields})
+
+
+def configure_logging(level=LOG_LEVEL):
+    """
+    Send log records to stderr at `level`, unless logging is already configured.
+    """
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
@@ -0,0 +1,45 @@
+def message_text(message):
+    """
+    Return the text of every text part of a message, one part per paragraph.
+
+    Non-text parts (image files, image URLs) are skipped.
+    """
+    return "\n\n".join(
+        part.text.value for part in message.content if part.type == "text" and part.text
+    )
+
+
+def run_messages(client, thread_id, run_id, limit=1):
+    """
+    Yield the assistant messages written by one run, oldest first.
+
+    The listing is filtered to the run and read in ascending order in
+    pages of `limit`, so a run that wrote one answer costs a single small
+    request however long the thread has grown. Further pages are only
+    fetched (via the `after` cursor) when the run wrote more.
+    """
+    for message in client.beta.threads.messages.list(
+        thread_id=thread_id, run_id=run_id, order="asc", limit=limit
+    ):
+        if message.role == "assistant":
+            yield message
+
+
+async def run_messages_async(client, thread_id, run_id, limit=1):
+    """
+    Async version of `run_messages` for openai.AsyncOpenAI clients.
+    """
+    async for message in client.beta.threads.messages.list(
+        thread_id=thread_id, run_id=run_id, order="asc", limit=limit
+    ):
+        if message.role == "assistant":
+            yield message
+
+
+def run_answer(client, thread_id, run_id):
+    """
+    Return the full text a run wrote, its messages separated by blank lines.
+    """
+    return "\n\n".join(
+        text for text in map(message_text, run_messages(client, thread_id, run_id)) if text
+    )
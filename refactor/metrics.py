@@ -0,0 +1,274 @@
+import bisect
+import glob
+import json
+import math
+import os
+import threading
+import time
+import uuid
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets in seconds; fine at the low end, where cached reads land
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Response body size buckets in bytes
+SIZE_BUCKETS = (0, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Seconds between writes of a process's samples to the shared metrics directory
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1"))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def snapshot(self):
+        """
+        Return this process's samples as JSON-ready [key, value] pairs.
+        """
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, values, snapshot, pid=None):
+        """
+        Add one process's `snapshot` into `values`, keyed like `_values`.
+        """
+        for key, value in snapshot:
+            key = tuple(key)
+            values[key] = self._add(values[key], value) if key in values else value
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if values is None:
+            with self._lock:
+                values = dict(self._values)
+        lines.extend(self._samples(sorted(values.items())))
+        return lines
+
+
+class Counter(_Metric):
+    """
+    A value that only goes up, per label combination.
+    """
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _add(self, value, other):
+        return value + other
+
+    def _samples(self, items):
+        for key, value in items:
+            yield f"{self.name}{_labels(self.labels, key)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    """
+    Observations counted into cumulative buckets, per label combination.
+
+    Rendered as `_bucket`, `_sum` and `_count` series, so quantiles such
+    as the p99 come from `histogram_quantile` on the scraping side.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0)
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                [list(key), [list(counts), total]]
+                for key, (counts, total) in self._values.items()
+            ]
+
+    def _add(self, value, other):
+        return [a + b for a, b in zip(value[0], other[0])], value[1] + other[1]
+
+    def _samples(self, items):
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = _labels(self.labels, key, [("le", _number(bound))])
+                yield f"{self.name}_bucket{le} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labels, key)} {cumulative}"
+
+
+class Gauge(_Metric):
+    """
+    A value read from `func` at scrape time, e.g. a cache's hit ratio.
+
+    Pass kind="counter" for values that only go up, such as hit counts
+    kept by the object being measured; these are summed across processes.
+    Other gauges are reported per process, with a `pid` label.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name, help, func, kind="gauge"):
+        super().__init__(name, help)
+        self.func = func
+        self.kind = kind
+
+    def snapshot(self):
+        return [[[], self.func()]]
+
+    def merge(self, values, snapshot, pid=None):
+        for _, value in snapshot:
+            if self.kind == "counter":
+                values[()] = values.get((), 0) + value
+            elif pid is not None:
+                values[(pid,)] = value
+
+    def render(self, values=None):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if values is None:
+            values = {(): self.func()}
+        for key, value in sorted(values.items()):
+            labels = _labels(("pid",), key) if key else ""
+            lines.append(f"{self.name}{labels} {_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    The metrics of one process, rendered in the Prometheus text format.
+
+    A deliberately small stand-in for prometheus_client: counters,
+    histograms and scrape-time gauges, without the extra dependency.
+
+    With several worker processes, give every worker the same `directory`.
+    Each one then writes its samples there every `flush_interval` seconds,
+    and `render` reports the sum over all of them, whichever worker is
+    scraped. Files of exited workers are kept so the sums never go back,
+    but their per-process gauges are dropped once the files go stale.
+    """
+
+    def __init__(self, directory=None, flush_interval=METRICS_FLUSH_INTERVAL):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = []
+        self._pid = None
+        self._path = None
+        self._flush_lock = threading.Lock()
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._add(Counter(name, help, labels))
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def gauge(self, name, help, func, kind="gauge"):
+        return self._add(Gauge(name, help, func, kind))
+
+    def start(self):
+        """
+        Start writing this process's samples to `directory` in the background.
+
+        Cheap to call on every request: it only does work the first time in
+        each process, so workers forked after import each get their own file.
+        """
+        if self.directory is None or self._pid == os.getpid():
+            return
+        with self._flush_lock:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            if self._pid is not None:
+                # Forked from a process that already counted: those counts are in its file
+                for metric in self._metrics:
+                    metric._values.clear()
+            self._pid = os.getpid()
+            # A restarted worker may reuse a pid; its counts must not replace the old ones
+            self._path = os.path.join(self.directory, f"{self._pid}-{uuid.uuid4().hex}.json")
+            threading.Thread(target=self._flush_forever, name="metrics-flush", daemon=True).start()
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def flush(self):
+        """
+        Write this process's samples to its file in `directory`.
+        """
+        self.start()
+        if self.directory is None:
+            return
+        snapshot = {metric.name: metric.snapshot() for metric in self._metrics}
+        with self._flush_lock:
+            with open(f"{self._path}.tmp", "w") as f:
+                json.dump(snapshot, f)
+            os.replace(f"{self._path}.tmp", self._path)
+
+    def _collect(self):
+        values = {metric.name: {} for metric in self._metrics}
+        stale_before = time.time() - 10 * self.flush_interval
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+                live = os.stat(path).st_mtime >= stale_before
+            except (OSError, ValueError):
+                continue  # removed, or replaced while being read
+            pid = os.path.basename(path).split("-", 1)[0]
+            for metric in self._metrics:
+                metric.merge(values[metric.name], snapshot.get(metric.name, []), pid if live else None)
+        return values
+
+    def render(self):
+        lines = []
+        values = {}
+        if self.directory is not None:
+            self.flush()
+            values = self._collect()
+        for metric in self._metrics:
+            lines.extend(metric.render(values.get(metric.name)))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,58 @@
+ENGLISH_MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+# Indonesian month names and the spellings that show up in the data and in
+# tool-call arguments, in calendar order
+INDONESIAN_MONTHS = [
+    ("Januari",),
+    ("Februari", "Pebruari", "Peb"),
+    ("Maret", "Mrt"),
+    ("April",),
+    ("Mei",),
+    ("Juni",),
+    ("Juli",),
+    ("Agustus", "Agu", "Agt", "Ags"),
+    ("September", "Sept"),
+    ("Oktober", "Okt"),
+    ("November", "Nopember", "Nop"),
+    ("Desember", "Des"),
+]
+
+
+def _build_month_index():
+    index = {}
+    for slot, (english, indonesian) in enumerate(zip(ENGLISH_MONTHS, INDONESIAN_MONTHS)):
+        number = slot + 1
+        spellings = [
+            str(number),
+            f"{number:02d}",
+            english,
+            english[:3],
+            indonesian[0][:3],
+            *indonesian,
+        ]
+        for spelling in spellings:
+            index[spelling.lower()] = slot
+    return index
+
+
+# Every accepted spelling, lower-cased, mapped to its 0-based month slot
+MONTH_INDEX = _build_month_index()
+
+
+def normalize_month(month):
+    """
+    Return the 0-based slot for a month name, abbreviation or number, or None.
+    """
+    if month is None:
+        return None
+    return MONTH_INDEX.get(str(month).strip().rstrip(".").lower())
+
+
+def month_name(slot):
+    """
+    Return the canonical (Indonesian) name for a 0-based month slot.
+    """
+    return INDONESIAN_MONTHS[slot][0]
@@ -1,38 +1,68 @@
+import httpx
+import logging
 import requests
 import os
+from typing import Annotated
+from refactor import sales_client
+from refactor.log import log_event
+from refactor.tool_output import TOOL_OUTPUT_TOKENS
+from refactor.tool_registry import ToolRegistry
 
-def fetch_sales_revenue(year, month):
-    url = f"http://127.0.0.1:5000/api/sales_revenue?year={year}&month={month}"
-    
-    try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            products = data.get("products", {})
-            final_summary = []
+logger = logging.getLogger(__name__)
 
-            for product, details in products.items():
-                sales = details.get("sales", "No Sales Data")
-                revenue = details.get("revenue", "No Revenue Data")
-                expenses = details.get("expenses", "No Expenses Data")
-                
-                summary = f"""
-                    Product = {product},
-                    Sales = {sales},
-                    Revenue = {revenue},
-                    Expenses = {expenses}
-                """
-                final_summary.append(summary)
-                
-            return final_summary
+# Tools for the managers in refactor/; async_tools has the coroutine
+# versions under the same names for AsyncAssistantManager
+tools = ToolRegistry()
+async_tools = ToolRegistry()
+
+# Token budget for each tool's output; larger outputs are summarized before submitting
+TOOL_TOKEN_BUDGETS = {
+    "fetch_sales_revenue": TOOL_OUTPUT_TOKENS,
+}
+
+Year = Annotated[str, "The year for which to fetch the sales data."]
+Month = Annotated[str, "The month for which to fetch the sales data, in Indonesian or English or as a number, e.g., Maret, March or 3."]
+
+@tools.tool
+def fetch_sales_revenue(year: Year, month: Month):
+    """
+    Fetch the sales, revenue and expenses of each product for a given year and month
+    """
+    try:
+        status_code, data = sales_client.get_json(
+            "/api/sales_revenue", {"year": year, "month": month}
+        )
+        if status_code == 200:
+            # The manager shapes the payload (CSV, or totals when over budget)
+            return data
         
         else:
-            print(f"Failed to fetch data: {response.status_code}")
-            return []
+            log_event(logger, logging.WARNING, "sales.fetch_failed", status=status_code, year=year, month=month)
+            return f"Error: Unable to fetch sales data for {month} {year}"
 
     except requests.exceptions.RequestException as e:
-        print("Error occurred during API request:", e)
-        return []
+        log_event(logger, logging.WARNING, "sales.request_error", error=e, year=year, month=month)
+        return f"Error occurred during API request: {e}"
+
+@async_tools.tool(name="fetch_sales_revenue")
+async def fetch_sales_revenue_async(year: Year, month: Month):
+    """
+    Fetch the sales, revenue and expenses of each product for a given year and month
+    """
+    try:
+        status_code, data = await sales_client.get_json_async(
+            "/api/sales_revenue", {"year": year, "month": month}
+        )
+        if status_code == 200:
+            return data
+        
+        else:
+            log_event(logger, logging.WARNING, "sales.fetch_failed", status=status_code, year=year, month=month)
+            return f"Error: Unable to fetch sales data for {month} {year}"
+
+    except httpx.HTTPError as e:
+        log_event(logger, logging.WARNING, "sales.request_error", error=e, year=year, month=month)
+        return f"Error occurred during API request: {e}"
 # news_api_key = os.environ.get("NEWS_API_KEY")
 
 # def get_news(topic):
@@ -0,0 +1,94 @@
+import os
+import random
+import time
+from dataclasses import dataclass
+
+# Run statuses that end a run without an answer
+RUN_FAILURE_STATUSES = ("failed", "cancelled", "expired", "incomplete")
+RUN_FAILURE_EVENTS = tuple(f"thread.run.{status}" for status in RUN_FAILURE_STATUSES)
+
+
+class RunFailedError(RuntimeError):
+    """
+    Raised when a run ends in one of RUN_FAILURE_STATUSES.
+    """
+
+    def __init__(self, run):
+        self.run = run
+        message = f"Run {run.id} ended with status '{run.status}'"
+        if getattr(run, "last_error", None):
+            message += f": {run.last_error.message}"
+        super().__init__(message)
+
+
+@dataclass
+class PollSchedule:
+    """
+    Exponential backoff with jitter for polling a run, bounded by a deadline.
+
+    Polling starts at `initial` seconds and grows by `multiplier` up to
+    `max_interval`. Each delay is randomized by +/- `jitter` (a fraction)
+    and the whole wait gives up after `deadline` seconds.
+    """
+
+    initial: float = 0.3
+    multiplier: float = 1.5
+    max_interval: float = 3.0
+    jitter: float = 0.2
+    deadline: float = 300.0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a schedule from RUN_POLL_* environment variables, falling back to the defaults.
+        """
+        defaults = cls()
+        return cls(
+            initial=float(os.environ.get("RUN_POLL_INITIAL", defaults.initial)),
+            multiplier=float(os.environ.get("RUN_POLL_MULTIPLIER", defaults.multiplier)),
+            max_interval=float(os.environ.get("RUN_POLL_MAX_INTERVAL", defaults.max_interval)),
+            jitter=float(os.environ.get("RUN_POLL_JITTER", defaults.jitter)),
+            deadline=float(os.environ.get("RUN_POLL_DEADLINE", defaults.deadline)),
+        )
+
+    def start(self):
+        return Poll(self)
+
+
+class Poll:
+    """
+    One wait on a run, following a PollSchedule.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.deadline = time.monotonic() + schedule.deadline
+        self.interval = schedule.initial
+
+    def next_delay(self):
+        """
+        Return the next delay in seconds, or None once the deadline has passed.
+        """
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        jitter = self.schedule.jitter
+        delay = self.interval * random.uniform(1 - jitter, 1 + jitter)
+        self.interval = min(self.interval * self.schedule.multiplier, self.schedule.max_interval)
+        return min(delay, remaining)
+
+    def wait(self):
+        """
+        Sleep for the next delay; return False instead once the deadline has passed.
+        """
+        delay = self.next_delay()
+        if delay is None:
+            return False
+        time.sleep(delay)
+        return True
+
+    def reset(self):
+        """
+        Go back to fast polls, e.g. after submitting tool outputs.
+        """
+        self.interval = self.schedule.initial
@@ -0,0 +1,63 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized JSON response bodies.
+
+    Each entry holds the identity body plus gzip (and brotli, when the
+    package is installed) variants, and is tagged with the data stamp it
+    was built from. A lookup with a newer stamp misses, so a write to the
+    underlying data invalidates every response that covered it.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, stamp):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, stamp, body):
+        """
+        Store `body` and its compressed variants, returning {encoding: bytes}.
+        """
+        variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_SIZE:
+            variants["gzip"] = gzip.compress(body, compresslevel=6)
+            if brotli is not None:
+                variants["br"] = brotli.compress(body)
+
+        with self._lock:
+            self._entries[key] = (stamp, variants)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return variants
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,63 @@
+import os
+
+import streamlit as st
+
+RUN_STEPS_PAGE_SIZE = int(os.environ.get("RUN_STEPS_PAGE_SIZE", "20"))
+
+
+def step_row(step):
+    """
+    Flatten a run step into one table row: type, tools, status, duration and tokens.
+    """
+    details = step.step_details
+    tools = ""
+    if details.type == "tool_calls":
+        tools = ", ".join(
+            call.function.name if call.type == "function" else call.type
+            for call in details.tool_calls
+        )
+
+    ended_at = step.completed_at or step.failed_at or step.cancelled_at or step.expired_at
+    usage = step.usage
+    return {
+        "type": step.type,
+        "tools": tools,
+        "status": step.status,
+        "seconds": ended_at - step.created_at if ended_at else None,
+        "prompt_tokens": usage.prompt_tokens if usage else None,
+        "completion_tokens": usage.completion_tokens if usage else None,
+    }
+
+
+def _load_page(manager, state, page_size):
+    steps, state["after"] = manager.run_steps(limit=page_size, after=state["after"])
+    state["rows"].extend(step_row(step) for step in steps)
+    state["more"] = state["after"] is not None
+
+
+@st.fragment
+def run_steps_panel(manager, page_size=RUN_STEPS_PAGE_SIZE):
+    """
+    Debug table of the manager's last run steps.
+
+    Nothing is fetched until the panel is switched on, then one page at a
+    time. As a fragment, toggling it or loading more steps only reruns
+    the panel, not the page above it.
+    """
+    if not (manager.thread and manager.run):
+        return
+    if not st.toggle("Show run steps", key="show_run_steps"):
+        return
+
+    state = st.session_state.get("run_steps")
+    if state is None or state["run_id"] != manager.run.id:
+        state = st.session_state["run_steps"] = {
+            "run_id": manager.run.id, "rows": [], "after": None, "more": True,
+        }
+    if not state["rows"] and state["more"]:
+        _load_page(manager, state, page_size)
+
+    st.dataframe(state["rows"], hide_index=True)
+    if state["more"]:
+        # The callback runs before the rerun, so the new page shows up right away
+        st.button("Load more steps", on_click=_load_page, args=(manager, state, page_size))
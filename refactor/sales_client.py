@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SALES_API_URL = os.environ.get("SALES_API_URL", "http://127.0.0.1:5000")
+
+# Connection pooling, timeout and retry settings for the shared session
+CONNECT_TIMEOUT = float(os.environ.get("SALES_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.environ.get("SALES_API_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.environ.get("SALES_API_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.environ.get("SALES_API_BACKOFF_FACTOR", "0.2"))
+POOL_SIZE = int(os.environ.get("SALES_API_POOL_SIZE", "16"))
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+# Most recent (ETag, payload) per URL, used to revalidate instead of re-downloading
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+MAX_VALIDATORS = 256
+
+
+def get_session():
+    """
+    Return the process-wide pooled session, creating it on first use.
+
+    Connections are kept alive and reused across tool calls. Idempotent
+    requests that fail to connect or hit a 502/503/504 are retried with
+    exponential backoff.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=MAX_RETRIES,
+                    backoff_factor=BACKOFF_FACTOR,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"GET", "HEAD"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def _url(path, params):
+    return requests.Request(
+        "GET", f"{SALES_API_URL}{path}",
+        params={k: v for k, v in (params or {}).items() if v is not None},
+    ).prepare().url
+
+
+def _cached(url):
+    with _validators_lock:
+        cached = _validators.get(url)
+        if cached:
+            _validators.move_to_end(url)
+        return cached
+
+
+def _remember(url, etag, payload):
+    with _validators_lock:
+        _validators[url] = (etag, payload)
+        _validators.move_to_end(url)
+        while len(_validators) > MAX_VALIDATORS:
+            _validators.popitem(last=False)
+
+
+def _result(url, cached, status_code, headers, read_json):
+    if status_code == 304 and cached:
+        return 200, cached[1]
+    if status_code != 200:
+        return status_code, None
+
+    payload = read_json()
+    etag = headers.get("ETag")
+    if etag:
+        _remember(url, etag, payload)
+    return 200, payload
+
+
+def get_json(path, params=None, timeout=None):
+    """
+    GET a sales API endpoint and return (status_code, payload).
+
+    Responses carrying an ETag are remembered, and the next request for
+    the same URL sends If-None-Match. A 304 answer returns the remembered
+    payload with status 200, so callers never see the revalidation.
+    `timeout` overrides the (connect, read) timeouts from the environment.
+    """
+    url = _url(path, params)
+    cached = _cached(url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+
+    response = get_session().get(
+        url, headers=headers, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    )
+    return _result(url, cached, response.status_code, response.headers, response.json)
+
+
+def get_async_client():
+    """
+    Return the pooled httpx.AsyncClient for the running event loop.
+
+    An AsyncClient is tied to the loop it was first used on, so each loop
+    gets its own, created on first use and reused afterwards.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            # httpx only retries failed connection attempts
+            transport=httpx.AsyncHTTPTransport(retries=MAX_RETRIES),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def get_json_async(path, params=None, timeout=None):
+    """
+    Async counterpart of get_json, sharing its ETag revalidation cache.
+    """
+    url = _url(path, params)
+    cached = _cached(url)
+    headers = {"If-None-Match": cached[0]} if cached else {}
+
+    kwargs = {"timeout": timeout} if timeout else {}
+    response = await get_async_client().get(url, headers=headers, **kwargs)
+    return _result(url, cached, response.status_code, response.headers, response.json)
+
+
+def data_version():
+    """
+    Return the sales data version, which changes on every write, or None
+    when the API cannot be reached.
+
+    The version endpoint sends an ETag, so checking it again is a bodyless
+    304 until the data changes.
+    """
+    try:
+        status_code, payload = get_json("/api/version")
+    except requests.exceptions.RequestException:
+        return None
+    return payload["version"] if status_code == 200 else None
+
+
+async def data_version_async():
+    """
+    Async counterpart of data_version.
+    """
+    try:
+        status_code, payload = await get_json_async("/api/version")
+    except httpx.HTTPError:
+        return None
+    return payload["version"] if status_code == 200 else None
@@ -0,0 +1,443 @@
+# Dummy data for sales, revenue, and expenses
+data = {
+    "2024": {
+        "Januari": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Februari": {
+            "products": {
+                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
+            }
+        },
+        "Maret": {
+            "products": {
+                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
+                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
+            }
+        },
+        "April": {
+            "products": {
+                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
+                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
+            }
+        },
+        "Mei": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juni": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 13000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 3000},
+                "ProductD": {"sales": 140, "revenue": 19000, "expenses": 4000},
+                "ProductE": {"sales": 170, "revenue": 11000, "expenses": 9500}
+            }
+        },
+        "Juli": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 13000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 17000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 18000, "expenses": 8500}
+            }
+        },
+        "Agustus": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8900}
+            }
+        },
+        "September": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 130, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 120, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 180, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Oktober": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 130, "revenue": 14000, "expenses": 8500}
+            }
+        },
+        "November": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 90, "revenue": 19000, "expenses": 10500},
+                "ProductC": {"sales": 160, "revenue": 13000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 150, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Desember": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 4500},
+                "ProductC": {"sales": 160, "revenue": 17000, "expenses": 8000},
+                "ProductD": {"sales": 10, "revenue": 1400, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        }
+    },
+    "2023": {
+        "Januari": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 50, "revenue": 15000, "expenses": 7000},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Februari": {
+            "products": {
+                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductB": {"sales": 160, "revenue": 13000, "expenses": 8000},
+                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductD": {"sales": 110, "revenue": 14000, "expenses": 5500},
+                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
+            }
+        },
+        "March": {
+            "products": {
+                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
+                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
+            }
+        },
+        "April": {
+            "products": {
+                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
+                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
+            }
+        },
+        "Mei": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juni": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juli": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Agustus": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "September": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
+            }
+        },
+        "Oktober": {
+            "products": {
+                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
+                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
+            }
+        },
+        "November": {
+            "products": {
+                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "December": {
+            "products": {
+                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
+            }
+        }
+    },
+    "2022": {
+        "Januari": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Februari": {
+            "products": {
+                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
+            }
+        },
+        "Maret": {
+            "products": {
+                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
+                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
+            }
+        },
+        "April": {
+            "products": {
+                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
+                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
+            }
+        },
+        "Mei": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juni": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juli": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Agustus": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "September": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
+            }
+        },
+        "Oktober": {
+            "products": {
+                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
+                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
+            }
+        },
+        "November": {
+            "products": {
+                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Desember": {
+            "products": {
+                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
+            }
+        }
+    },
+    "2021": {
+        "Januari": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7000},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Februari": {
+            "products": {
+                "ProductA": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductB": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductC": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductD": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductE": {"sales": 140, "revenue": 14000, "expenses": 7000}
+            }
+        },
+        "Maret": {
+            "products": {
+                "ProductA": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductB": {"sales": 170, "revenue": 17000, "expenses": 8500},
+                "ProductC": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductD": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductE": {"sales": 150, "revenue": 15000, "expenses": 7500}
+            }
+        },
+        "April": {
+            "products": {
+                "ProductA": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductB": {"sales": 180, "revenue": 18000, "expenses": 9000},
+                "ProductC": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductD": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductE": {"sales": 160, "revenue": 16000, "expenses": 8000}
+            }
+        },
+        "Mei": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juni": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Juli": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "Agustus": {
+            "products": {
+                "ProductA": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductB": {"sales": 190, "revenue": 19000, "expenses": 9500},
+                "ProductC": {"sales": 160, "revenue": 16000, "expenses": 8000},
+                "ProductD": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductE": {"sales": 170, "revenue": 17000, "expenses": 8500}
+            }
+        },
+        "September": {
+            "products": {
+                "ProductA": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductB": {"sales": 130, "revenue": 13000, "expenses": 6500},
+                "ProductC": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductD": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductE": {"sales": 120, "revenue": 12000, "expenses": 6000}
+            }
+        },
+        "Oktober": {
+            "products": {
+                "ProductA": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductB": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductC": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductD": {"sales": 70, "revenue": 7000, "expenses": 3500},
+                "ProductE": {"sales": 100, "revenue": 10000, "expenses": 5000}
+            }
+        },
+        "November": {
+            "products": {
+                "ProductA": {"sales": 110, "revenue": 11000, "expenses": 5500},
+                "ProductB": {"sales": 150, "revenue": 15000, "expenses": 7500},
+                "ProductC": {"sales": 120, "revenue": 12000, "expenses": 6000},
+                "ProductD": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductE": {"sales": 130, "revenue": 13000, "expenses": 6500}
+            }
+        },
+        "Desember": {
+            "products": {
+                "ProductA": {"sales": 90, "revenue": 9000, "expenses": 4500},
+                "ProductB": {"sales": 140, "revenue": 14000, "expenses": 7000},
+                "ProductC": {"sales": 100, "revenue": 10000, "expenses": 5000},
+                "ProductD": {"sales": 80, "revenue": 8000, "expenses": 4000},
+                "ProductE": {"sales": 100, "revenue": 12000, "expenses": 6000}
+            }
+        }
+    }
+}
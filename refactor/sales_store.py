@@ -0,0 +1,717 @@
+import json
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # No cross-process locking on Windows; run a single worker there
+    fcntl = None
+
+from refactor.months import month_name, normalize_month
+
+METRICS = ("sales", "revenue", "expenses")
+DIMENSIONS = ("year", "month", "product")
+MONTHS_PER_YEAR = 12
+
+# On-disk layout: a fixed header, a JSON index of the year, month and
+# product labels padded to a reserved size, then the records, presence
+# mask, record stamps, totals and their stamps as raw little-endian
+# arrays, each aligned so they can be memory-mapped directly. The product
+# axis is stored with spare capacity, so new products and month labels
+# are written in place; only a new year or a full product axis rewrites
+# the file.
+MAGIC = b"SALESDB1"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIIIIIIIIQ7Q")
+ALIGNMENT = 64
+MIN_PRODUCT_CAPACITY = 16
+MIN_INDEX_CAPACITY = 4096
+RECORD_SIZE = len(METRICS) * 8
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _pad_products(array, capacity, dtype):
+    array = np.ascontiguousarray(array, dtype=dtype)
+    extra = capacity - array.shape[2]
+    if extra:
+        padding = np.zeros(array.shape[:2] + (extra,) + array.shape[3:], dtype=dtype)
+        array = np.concatenate([array, padding], axis=2)
+    return array
+
+
+def _read_header(fd):
+    if hasattr(os, "pread"):
+        return os.pread(fd, HEADER.size, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+    return os.read(fd, HEADER.size)
+
+
+@contextmanager
+def _file_lock(path, exclusive):
+    """
+    Hold an advisory lock on `path`'s lock file, shared or exclusive.
+
+    The lock lives in a separate file because saving replaces the data
+    file, and a lock on the replaced inode would no longer exclude anyone.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "a+b") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class SalesStore:
+    """
+    Columnar sales store indexed by (year, month, product).
+
+    Values live in one int64 array of shape (years, 12, products, metrics)
+    with a matching presence mask. The month axis is the calendar month,
+    so every accepted spelling of a month resolves to the same slot. The
+    per-month and per-year totals are computed once so summary lookups do
+    not walk the records. Writes go through `upsert`, which applies the
+    change to the totals as a delta instead of recomputing them.
+
+    A store opened from a file with `open` memory-maps the arrays
+    copy-on-write, so workers share the file's pages. The file has a
+    single writer at a time: a write takes an exclusive lock on it,
+    reloads the store if another worker changed the file since it was
+    mapped, applies the change and writes it through before releasing the
+    lock. Readers call `refresh` to re-map the file once another worker
+    has written to it.
+
+    Every record, month and year carries a modification stamp in
+    microseconds since the epoch, strictly increasing across writes, which
+    the API turns into ETag and Last-Modified validators. The stamps are
+    stored in the file, so all workers agree on them.
+    """
+
+    def __init__(self, years, month_labels, products, values, present,
+                 month_totals=None, year_totals=None, stamps=None):
+        self.version = 0
+        self.path = None
+        self._layout = None
+        self._generation = 0
+        self._inode = None
+        self._lock = threading.Lock()
+
+        if month_totals is None or year_totals is None:
+            month_totals = values.sum(axis=2)
+            year_totals = month_totals.sum(axis=1)
+        if stamps is None:
+            # Records loaded together share one stamp; writes stamp what they touch
+            clock = time.time_ns() // 1000
+            stamps = (
+                np.full(present.shape, clock, dtype=np.int64),
+                np.full(present.shape[:2], clock, dtype=np.int64),
+                np.full(present.shape[:1], clock, dtype=np.int64),
+            )
+        self._set_data(years, month_labels, products, values, present,
+                       month_totals, year_totals, stamps)
+
+    def _set_data(self, years, month_labels, products, values, present,
+                  month_totals, year_totals, stamps):
+        self.years = list(years)
+        self.products = list(products)
+        self.month_labels = [list(labels) for labels in month_labels]
+        self.values = values
+        self.present = present
+        self.month_totals = month_totals
+        self.year_totals = year_totals
+        self.stamps, self.month_stamps, self.year_stamps = stamps
+
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+        self.product_index = {product: i for i, product in enumerate(self.products)}
+        self.version += 1
+        self._stats_cache = {}
+        self._dirty = set()
+        self._index_changed = False
+        self._layout_changed = False
+        self._clock = int(self.year_stamps.max(initial=0))
+
+    @classmethod
+    def from_nested(cls, data):
+        """
+        Build a store from the nested {year: {month: {"products": {...}}}} layout.
+        """
+        years = list(data)
+        products = []
+        product_index = {}
+        for year_data in data.values():
+            for month_data in year_data.values():
+                for product in month_data["products"]:
+                    if product not in product_index:
+                        product_index[product] = len(products)
+                        products.append(product)
+
+        values = np.zeros(
+            (len(years), MONTHS_PER_YEAR, len(products), len(METRICS)), dtype=np.int64
+        )
+        present = np.zeros((len(years), MONTHS_PER_YEAR, len(products)), dtype=bool)
+        month_labels = []
+
+        for y, year in enumerate(years):
+            labels = [None] * MONTHS_PER_YEAR
+            for month, month_data in data[year].items():
+                m = normalize_month(month)
+                if m is None:
+                    raise ValueError(f"Unknown month {month!r} in year {year}")
+                if labels[m] is not None:
+                    raise ValueError(f"Year {year} lists both {labels[m]!r} and {month!r}")
+                labels[m] = month
+                for product, details in month_data["products"].items():
+                    p = product_index[product]
+                    values[y, m, p] = [details[metric] for metric in METRICS]
+                    present[y, m, p] = True
+            month_labels.append(labels)
+
+        return cls(years, month_labels, products, values, present)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Memory-map a store previously written with `save`.
+        """
+        store = cls.__new__(cls)
+        store.version = 0
+        store._lock = threading.Lock()
+        with _file_lock(path, exclusive=False):
+            store._load(path)
+        return store
+
+    def _load(self, path):
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            header = _read_header(fd)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a sales data file")
+            (magic, version, n_years, n_months, n_products, capacity, n_metrics,
+             index_length, index_capacity, generation, *offsets) = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a sales data file")
+            if version != FORMAT_VERSION or n_months != MONTHS_PER_YEAR or n_metrics != len(METRICS):
+                raise ValueError(f"{path} uses an unsupported layout (version {version})")
+            os.lseek(fd, HEADER.size, os.SEEK_SET)
+            index = json.loads(os.read(fd, index_length).decode("utf-8"))
+            for labels in index["months"]:
+                for slot, label in enumerate(labels):
+                    if label is not None and normalize_month(label) != slot:
+                        raise ValueError(f"{path} stores month {label!r} in slot {slot}")
+            inode = os.fstat(fd).st_ino
+        finally:
+            os.close(fd)
+
+        (records_offset, mask_offset, stamps_offset, month_totals_offset,
+         month_stamps_offset, year_totals_offset, year_stamps_offset) = offsets
+        cube = (n_years, MONTHS_PER_YEAR, capacity)
+        self._set_data(
+            index["years"], index["months"], index["products"],
+            _map(path, "<i8", records_offset, cube + (len(METRICS),)),
+            _map(path, "|b1", mask_offset, cube),
+            _map(path, "<i8", month_totals_offset, (n_years, MONTHS_PER_YEAR, len(METRICS))),
+            _map(path, "<i8", year_totals_offset, (n_years, len(METRICS))),
+            (
+                _map(path, "<i8", stamps_offset, cube),
+                _map(path, "<i8", month_stamps_offset, (n_years, MONTHS_PER_YEAR)),
+                _map(path, "<i8", year_stamps_offset, (n_years,)),
+            ),
+        )
+        self.path = path
+        self._inode = inode
+        self._generation = generation
+        self._layout = (capacity, index_capacity, tuple(offsets))
+
+    def _stale(self):
+        """
+        Return True when another worker has written the file since it was mapped.
+
+        The header is read through a descriptor of its own, opened by path,
+        so this is safe without `_lock` while another thread reloads.
+        """
+        if self.path is None:
+            return False
+        try:
+            fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            return False
+        try:
+            if os.fstat(fd).st_ino != self._inode:
+                return True
+            return HEADER.unpack(_read_header(fd))[9] != self._generation
+        finally:
+            os.close(fd)
+
+    def refresh(self):
+        """
+        Re-map the file if another worker has written to it.
+
+        Costs a stat and a header read when nothing changed, so it can run
+        before every request.
+        """
+        if not self._stale():
+            return False
+        with self._lock, _file_lock(self.path, exclusive=False):
+            if self._stale():
+                self._load(self.path)
+        return True
+
+    def save(self, path):
+        """
+        Write the whole store to `path`, replacing any existing file atomically.
+        """
+        with self._lock, _file_lock(path, exclusive=True):
+            self._save(path)
+
+    def _index(self):
+        return json.dumps(
+            {"years": self.years, "months": self.month_labels, "products": self.products}
+        ).encode("utf-8")
+
+    def _save(self, path):
+        n = len(self.products)
+        capacity = max(self.values.shape[2], 2 * n, MIN_PRODUCT_CAPACITY)
+        index = self._index()
+        index_capacity = _align(max(2 * len(index), MIN_INDEX_CAPACITY))
+        arrays = [
+            _pad_products(self.values, capacity, "<i8"),
+            _pad_products(self.present, capacity, "|b1"),
+            _pad_products(self.stamps, capacity, "<i8"),
+            np.ascontiguousarray(self.month_totals, dtype="<i8"),
+            np.ascontiguousarray(self.month_stamps, dtype="<i8"),
+            np.ascontiguousarray(self.year_totals, dtype="<i8"),
+            np.ascontiguousarray(self.year_stamps, dtype="<i8"),
+        ]
+        offsets = []
+        offset = HEADER.size + index_capacity
+        for array in arrays:
+            offset = _align(offset)
+            offsets.append(offset)
+            offset += array.nbytes
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.years), MONTHS_PER_YEAR, n,
+                                capacity, len(METRICS), len(index), index_capacity,
+                                self._generation + 1, *offsets))
+            f.write(index.ljust(index_capacity))
+            for offset, array in zip(offsets, arrays):
+                f.seek(offset)
+                array.tofile(f)
+        os.replace(tmp_path, path)
+
+        # Re-map the new file so this worker shares its pages like the others
+        self._load(path)
+
+    def _persist(self):
+        """
+        Write pending changes through to the file; the caller holds the file lock.
+
+        Changed records, the totals and the index are written in place and
+        the header goes last, bumping the generation other workers watch.
+        A new year, or a product or index that no longer fits the reserved
+        space, rewrites the whole file instead.
+        """
+        if self.path is None or not (self._dirty or self._index_changed or self._layout_changed):
+            return
+        index = self._index()
+        capacity, index_capacity, offsets = self._layout
+        if self._layout_changed or len(index) > index_capacity:
+            self._save(self.path)
+            return
+
+        (records_offset, mask_offset, stamps_offset, month_totals_offset,
+         month_stamps_offset, year_totals_offset, year_stamps_offset) = offsets
+        with open(self.path, "r+b") as f:
+            for y, m, p in sorted(self._dirty):
+                cell = (y * MONTHS_PER_YEAR + m) * capacity + p
+                f.seek(records_offset + cell * RECORD_SIZE)
+                f.write(self.values[y, m, p].astype("<i8").tobytes())
+                f.seek(mask_offset + cell)
+                f.write(b"\x01" if self.present[y, m, p] else b"\x00")
+                f.seek(stamps_offset + cell * 8)
+                f.write(np.int64(self.stamps[y, m, p]).astype("<i8").tobytes())
+            for offset, array in ((month_totals_offset, self.month_totals),
+                                  (month_stamps_offset, self.month_stamps),
+                                  (year_totals_offset, self.year_totals),
+                                  (year_stamps_offset, self.year_stamps)):
+                f.seek(offset)
+                f.write(np.ascontiguousarray(array, dtype="<i8").tobytes())
+            if self._index_changed:
+                f.seek(HEADER.size)
+                f.write(index.ljust(index_capacity))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.years), MONTHS_PER_YEAR,
+                                len(self.products), capacity, len(METRICS), len(index),
+                                index_capacity, self._generation + 1, *offsets))
+
+        self._generation += 1
+        self._dirty.clear()
+        self._index_changed = False
+
+    @contextmanager
+    def _writing(self):
+        """
+        Serialize a write against this process's threads and other workers.
+
+        The store is reloaded first if another worker wrote to the file, so
+        the change applies to (and the deltas are computed from) the current
+        data, and is written through before the lock is released.
+        """
+        file_lock = _file_lock(self.path, exclusive=True) if self.path else nullcontext()
+        with self._lock, file_lock:
+            if self._stale():
+                self._load(self.path)
+            yield
+            self._persist()
+
+    def _ensure_year(self, year):
+        y = self.year_index.get(year)
+        if y is None:
+            y = len(self.years)
+            shape = (1,) + self.values.shape[1:]
+            self.values = np.concatenate([self.values, np.zeros(shape, dtype=self.values.dtype)])
+            self.present = np.concatenate([self.present, np.zeros(shape[:3], dtype=bool)])
+            self.month_totals = np.concatenate(
+                [self.month_totals, np.zeros((1,) + self.month_totals.shape[1:], dtype=np.int64)]
+            )
+            self.year_totals = np.concatenate(
+                [self.year_totals, np.zeros((1, len(METRICS)), dtype=np.int64)]
+            )
+            self.stamps = np.concatenate([self.stamps, np.zeros(shape[:3], dtype=np.int64)])
+            self.month_stamps = np.concatenate(
+                [self.month_stamps, np.zeros((1, MONTHS_PER_YEAR), dtype=np.int64)]
+            )
+            self.year_stamps = np.append(self.year_stamps, 0)
+            self.years.append(year)
+            self.year_index[year] = y
+            self.month_labels.append([None] * MONTHS_PER_YEAR)
+            self._layout_changed = True
+        return y
+
+    def _ensure_month(self, y, month):
+        m = normalize_month(month)
+        if m is None:
+            raise ValueError(f"Unknown month {month!r}")
+        if self.month_labels[y][m] is None:
+            self.month_labels[y][m] = month
+            self._index_changed = True
+        return m
+
+    def _ensure_product(self, product):
+        p = self.product_index.get(product)
+        if p is None:
+            p = len(self.products)
+            capacity = self.values.shape[2]
+            if p >= capacity:
+                # Grow the product axis geometrically so inserts stay amortized O(1)
+                extra = max(capacity, 1)
+                self.values = np.concatenate(
+                    [self.values, np.zeros(self.values.shape[:2] + (extra, len(METRICS)), dtype=self.values.dtype)],
+                    axis=2,
+                )
+                self.present = np.concatenate(
+                    [self.present, np.zeros(self.present.shape[:2] + (extra,), dtype=bool)], axis=2
+                )
+                self.stamps = np.concatenate(
+                    [self.stamps, np.zeros(self.stamps.shape[:2] + (extra,), dtype=np.int64)], axis=2
+                )
+                self._layout_changed = True
+            self.products.append(product)
+            self.product_index[product] = p
+            self._index_changed = True
+        return p
+
+    def upsert(self, year, month, product, record, create=True):
+        """
+        Write one record and apply the change to the totals as a delta.
+
+        Metrics missing from `record` keep their current value (zero for a
+        new record). With `create=False` the record must already exist.
+        Returns True when a new record was created. An invalid record
+        raises ValueError (KeyError for a missing one) and changes nothing.
+        """
+        with self._writing():
+            self._validate(year, month, product, record, create)
+            return self._upsert(year, month, product, record, create)
+
+    def upsert_many(self, records):
+        """
+        Apply a batch of {"year", "month", "product", <metrics>} records.
+
+        Every record is validated before any is applied, so a bad record
+        fails the whole batch (ValueError naming its position) and leaves
+        the store untouched.
+        """
+        with self._writing():
+            for i, r in enumerate(records):
+                try:
+                    self._validate(r["year"], r["month"], r["product"], r, True)
+                except ValueError as e:
+                    raise ValueError(f"Record {i}: {e}") from None
+            return sum(
+                self._upsert(r["year"], r["month"], r["product"], r, True) for r in records
+            )
+
+    def _validate(self, year, month, product, record, create):
+        """
+        Check a record can be applied, without changing any state.
+        """
+        m = normalize_month(month)
+        if m is None:
+            raise ValueError(f"Unknown month {month!r}")
+        for metric in METRICS:
+            value = record.get(metric)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, np.integer)):
+                raise ValueError(f"'{metric}' must be an integer")
+            if not INT64_MIN <= value <= INT64_MAX:
+                raise ValueError(f"'{metric}' is out of range")
+        if not create:
+            y = self.year_index.get(year)
+            p = self.product_index.get(product)
+            if y is None or p is None or self.month_labels[y][m] is None or not self.present[y, m, p]:
+                raise KeyError((year, month, product))
+
+    def _upsert(self, year, month, product, record, create):
+        if not create:
+            y = self.year_index[year]
+            m = self.month_slot(y, month)
+            p = self.product_index[product]
+        else:
+            y = self._ensure_year(year)
+            m = self._ensure_month(y, month)
+            p = self._ensure_product(product)
+
+        old = self.values[y, m, p].copy()
+        new = old.copy()
+        for i, metric in enumerate(METRICS):
+            if metric in record:
+                new[i] = record[metric]
+        delta = new - old
+
+        created = not self.present[y, m, p]
+        self.values[y, m, p] = new
+        self.present[y, m, p] = True
+        self.month_totals[y, m] += delta
+        self.year_totals[y] += delta
+        self._dirty.add((y, m, p))
+        self.version += 1
+
+        self._clock = max(self._clock + 1, time.time_ns() // 1000)
+        self.stamps[y, m, p] = self._clock
+        self.month_stamps[y, m] = self._clock
+        self.year_stamps[y] = self._clock
+        return created
+
+    def stamp(self, y, m=None, p=None):
+        """
+        Return the latest modification stamp of a year, month or record.
+        """
+        if m is None:
+            return int(self.year_stamps[y])
+        if p is None:
+            return int(self.month_stamps[y, m])
+        return int(self.stamps[y, m, p])
+
+    def data_stamp(self):
+        """
+        Return the latest modification stamp over the whole store.
+        """
+        return int(self.year_stamps.max(initial=0))
+
+    def query_stamp(self, years, months):
+        """
+        Return the latest modification stamp over several years and months.
+        """
+        return int(self.month_stamps[np.ix_(years, months)].max(initial=0))
+
+    def stats_stamp(self, y, m=None):
+        """
+        Return the stamp that `stats` for a year or month depends on.
+        """
+        stamp = self.stamp(y, m)
+        previous = None if m is None else self._previous_month(y, m)
+        if previous is not None:
+            stamp = max(stamp, self.stamp(*previous))
+        return stamp
+
+    def year_slot(self, year):
+        return self.year_index.get(year)
+
+    def month_slot(self, y, month):
+        """
+        Return the slot of a month of year `y` under any accepted spelling.
+        """
+        m = normalize_month(month)
+        if m is None or self.month_labels[y][m] is None:
+            return None
+        return m
+
+    def product_slot(self, product):
+        return self.product_index.get(product)
+
+    def totals(self, y, m=None):
+        """
+        Return the precomputed totals for a year, or for one month of it.
+        """
+        row = self.year_totals[y] if m is None else self.month_totals[y, m]
+        return {f"total_{metric}": int(row[i]) for i, metric in enumerate(METRICS)}
+
+    def product_payload(self, y, m, p):
+        row = self.values[y, m, p]
+        return {metric: int(row[i]) for i, metric in enumerate(METRICS)}
+
+    def month_payload(self, y, m):
+        return {
+            "products": {
+                product: self.product_payload(y, m, p)
+                for p, product in enumerate(self.products)
+                if self.present[y, m, p]
+            }
+        }
+
+    def year_payload(self, y):
+        return {
+            label: self.month_payload(y, m)
+            for m, label in enumerate(self.month_labels[y])
+            if label is not None
+        }
+
+
+    def query(self, years, months, products, group_by=()):
+        """
+        Sum the records selected by year, month and product slots.
+
+        The selected sub-cube is reduced over every dimension not listed in
+        `group_by`, and one row is returned per group that has records.
+        """
+        cells = np.ix_(years, months, products)
+        values = self.values[cells]
+        present = self.present[cells]
+
+        axes = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in group_by)
+        sums = values.sum(axis=axes)
+        counts = present.sum(axis=axes)
+
+        selections = (years, months, products)
+        kept = [i for i, dim in enumerate(DIMENSIONS) if dim in group_by]
+        rows = []
+        for group in np.ndindex(counts.shape):
+            if not counts[group]:
+                continue
+            row = {}
+            for axis, position in zip(kept, group):
+                slot = selections[axis][position]
+                if axis == 0:
+                    row["year"] = self.years[slot]
+                elif axis == 1:
+                    row["month"] = month_name(slot)
+                else:
+                    row["product"] = self.products[slot]
+            total = sums[group]
+            for i, metric in enumerate(METRICS):
+                row[metric] = int(total[i])
+            row["records"] = int(counts[group])
+            rows.append(row)
+        return rows
+
+    def stats(self, y, m=None):
+        """
+        Return highest/lowest product, range and percentiles per metric.
+
+        For a month the result also holds each product's change from the
+        previous month; for a year, the best and worst month per metric.
+        Results are cached until the next write.
+        """
+        key = (y, m)
+        cached = self._stats_cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        n = len(self.products)
+        if m is None:
+            values = self.values[y, :, :n].sum(axis=0)
+            present = self.present[y, :, :n].any(axis=0)
+        else:
+            values = self.values[y, m, :n]
+            present = self.present[y, m, :n]
+        slots = np.flatnonzero(present)
+
+        result = {"products": len(slots), "metrics": {}}
+        if len(slots):
+            for i, metric in enumerate(METRICS):
+                column = values[slots, i]
+                low, median, high = np.percentile(column, [25, 50, 75])
+                result["metrics"][metric] = {
+                    "highest": self._ranked(slots, column, np.argmax),
+                    "lowest": self._ranked(slots, column, np.argmin),
+                    "range": int(column.max() - column.min()),
+                    "mean": round(float(column.mean()), 2),
+                    "p25": round(float(low), 2),
+                    "median": round(float(median), 2),
+                    "p75": round(float(high), 2),
+                }
+
+        if m is None:
+            months = [slot for slot, label in enumerate(self.month_labels[y]) if label is not None]
+            if months:
+                totals = self.month_totals[y, months]
+                for i, metric in enumerate(METRICS):
+                    if metric in result["metrics"]:
+                        best, worst = np.argmax(totals[:, i]), np.argmin(totals[:, i])
+                        result["metrics"][metric]["best_month"] = {
+                            "month": month_name(months[best]), "value": int(totals[best, i])
+                        }
+                        result["metrics"][metric]["worst_month"] = {
+                            "month": month_name(months[worst]), "value": int(totals[worst, i])
+                        }
+        else:
+            previous = self._previous_month(y, m)
+            if previous is not None:
+                py, pm = previous
+                deltas = self.values[y, m, :n] - self.values[py, pm, :n]
+                both = np.flatnonzero(present & self.present[py, pm, :n])
+                result["previous_month"] = {"year": self.years[py], "month": month_name(pm)}
+                result["month_over_month"] = {
+                    self.products[p]: {metric: int(deltas[p, i]) for i, metric in enumerate(METRICS)}
+                    for p in both
+                }
+
+        self._stats_cache[key] = (self.version, result)
+        return result
+
+    def _ranked(self, slots, column, pick):
+        position = pick(column)
+        return {"product": self.products[slots[position]], "value": int(column[position])}
+
+    def _previous_month(self, y, m):
+        if m > 0:
+            return (y, m - 1) if self.month_labels[y][m - 1] is not None else None
+        try:
+            py = self.year_index.get(str(int(self.years[y]) - 1))
+        except ValueError:
+            return None
+        if py is None or self.month_labels[py][MONTHS_PER_YEAR - 1] is None:
+            return None
+        return py, MONTHS_PER_YEAR - 1
+
+def _map(path, dtype, offset, shape):
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    # Copy-on-write: workers share the file's pages, and a worker's own
+    # writes stay private until `_persist` writes them to the file
+    return np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=shape)
@@ -0,0 +1,199 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import openai
+
+from refactor.polling import PollSchedule
+
+THREAD_REGISTRY_PATH = os.environ.get(
+    "THREAD_REGISTRY_PATH", os.path.join(os.path.dirname(__file__), "threads.sqlite3")
+)
+
+# A session's thread is rotated once it is older than THREAD_TTL, idle for
+# longer than THREAD_IDLE_TTL, or has served THREAD_MAX_RUNS runs
+THREAD_TTL = float(os.environ.get("THREAD_TTL", 24 * 60 * 60))
+THREAD_IDLE_TTL = float(os.environ.get("THREAD_IDLE_TTL", 2 * 60 * 60))
+THREAD_MAX_RUNS = int(os.environ.get("THREAD_MAX_RUNS", 20))
+# Cleanup never retires a thread used within THREAD_RUN_GRACE seconds, so a
+# run still being polled (for up to RUN_POLL_DEADLINE) keeps its thread
+THREAD_RUN_GRACE = float(
+    os.environ.get("THREAD_RUN_GRACE", 2 * PollSchedule.from_env().deadline)
+)
+
+_cleanup_executor = None
+_cleanup_executor_lock = threading.Lock()
+
+
+def get_cleanup_executor():
+    """
+    Return the single background worker that deletes retired threads.
+
+    Cleanup makes serial delete calls, so it gets its own worker instead
+    of occupying the tool-call pool that runs are waiting on.
+    """
+    global _cleanup_executor
+    if _cleanup_executor is None:
+        with _cleanup_executor_lock:
+            if _cleanup_executor is None:
+                _cleanup_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="thread-cleanup"
+                )
+    return _cleanup_executor
+
+
+class ThreadRegistry:
+    """
+    Maps user sessions to OpenAI threads, persisted in SQLite.
+
+    Each session has at most one current thread. A thread that is too
+    old, idle for too long or has served too many runs is retired, so the
+    session's next run starts a fresh, short thread. Retired threads stay
+    listed until `cleanup` deletes them, which also retires the threads
+    of sessions that never came back.
+    """
+
+    def __init__(self, path=THREAD_REGISTRY_PATH, ttl=THREAD_TTL,
+                 idle_ttl=THREAD_IDLE_TTL, max_runs=THREAD_MAX_RUNS,
+                 run_grace=THREAD_RUN_GRACE):
+        self.path = path
+        self.ttl = ttl
+        self.idle_ttl = idle_ttl
+        self.max_runs = max_runs
+        self.run_grace = run_grace
+        self._lock = threading.Lock()
+
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS threads (
+                    thread_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    runs INTEGER NOT NULL DEFAULT 0,
+                    retired INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS threads_session ON threads (session_id, retired)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def current(self, session_id):
+        """
+        Return the session's current thread ID, or None if it has none.
+
+        A thread past its TTL, idle TTL or run limit is retired here.
+        """
+        now = time.time()
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT thread_id, created_at, last_used_at, runs FROM threads "
+                "WHERE session_id = ? AND retired = 0",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            thread_id, created_at, last_used_at, runs = row
+            if self._expired(now, created_at, last_used_at, runs):
+                db.execute("UPDATE threads SET retired = 1 WHERE thread_id = ?", (thread_id,))
+                return None
+            return thread_id
+
+    def _expired(self, now, created_at, last_used_at, runs):
+        return (now - created_at > self.ttl or now - last_used_at > self.idle_ttl
+                or runs >= self.max_runs)
+
+    def assign(self, session_id, thread_id):
+        """
+        Make `thread_id` the session's current thread, retiring any other.
+        """
+        now = time.time()
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE threads SET retired = 1 WHERE session_id = ? AND thread_id != ?",
+                (session_id, thread_id),
+            )
+            db.execute(
+                "INSERT OR IGNORE INTO threads (thread_id, session_id, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?)",
+                (thread_id, session_id, now, now),
+            )
+
+    def runs(self, thread_id):
+        """
+        Return how many runs the thread has served, or 0 if it is not listed.
+        """
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT runs FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        return row[0] if row else 0
+
+    def record_run(self, thread_id):
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE threads SET runs = runs + 1, last_used_at = ? WHERE thread_id = ?",
+                (time.time(), thread_id),
+            )
+
+    def retired(self, limit=50):
+        """
+        Return up to `limit` retired thread IDs still waiting to be deleted.
+
+        Threads past their TTL or idle TTL are retired first, so an
+        abandoned session's thread is cleaned up without the session ever
+        asking for it again. A thread used within `run_grace` seconds may
+        still have a run going and is left alone; the run limit is only
+        enforced by `current`, for the session that owns the thread.
+        """
+        now = time.time()
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE threads SET retired = 1 WHERE retired = 0 AND "
+                "(? - created_at > ? OR ? - last_used_at > ?) AND ? - last_used_at > ?",
+                (now, self.ttl, now, self.idle_ttl, now, self.run_grace),
+            )
+            rows = db.execute(
+                "SELECT thread_id FROM threads WHERE retired = 1 LIMIT ?", (limit,)
+            ).fetchall()
+        return [thread_id for (thread_id,) in rows]
+
+    def forget(self, thread_ids):
+        with self._lock, self._connect() as db:
+            db.executemany(
+                "DELETE FROM threads WHERE thread_id = ?", [(t,) for t in thread_ids]
+            )
+
+    def cleanup(self, delete, limit=50):
+        """
+        Delete up to `limit` retired threads with `delete(thread_id)` and forget them.
+
+        A thread whose delete call fails is kept and tried again next time.
+        Returns the number of threads removed.
+        """
+        removed = []
+        for thread_id in self.retired(limit):
+            try:
+                delete(thread_id)
+            except openai.NotFoundError:
+                pass  # already gone on the OpenAI side
+            except openai.OpenAIError:
+                continue  # keep it and retry on the next cleanup
+            removed.append(thread_id)
+
+        self.forget(removed)
+        return len(removed)
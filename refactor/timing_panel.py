@@ -0,0 +1,72 @@
+import streamlit as st
+
+# Latency breakdown of a request: label and the span names it adds up
+PHASES = (
+    ("queue", ("run.queue",)),
+    ("model", ("run.model",)),
+    ("tools", ("tool_calls",)),
+    ("submit", ("tool_outputs.submit",)),
+    ("polling", ("run.poll",)),
+    ("messages", ("message.create", "message.fetch")),
+)
+
+
+def breakdown(spans):
+    """
+    Return {phase: seconds} for the spans of one trace, plus the total.
+    """
+    totals = {}
+    for label, names in PHASES:
+        totals[label] = round(
+            sum(span["duration_ms"] for span in spans if span["name"] in names) / 1000, 3
+        )
+    roots = [span for span in spans if span["parent_span_id"] is None]
+    totals["total"] = round(sum(span["duration_ms"] for span in roots) / 1000, 3)
+    return totals
+
+
+def _depth(parents, span_id):
+    depth = 0
+    while parents.get(span_id) in parents:
+        span_id = parents[span_id]
+        depth += 1
+    return depth
+
+
+def span_rows(spans):
+    """
+    Flatten a trace into table rows, indenting each span name by its depth.
+    """
+    if not spans:
+        return []
+    parents = {span["span_id"]: span["parent_span_id"] for span in spans}
+    origin = min(span["start_time_unix_nano"] for span in spans)
+    rows = []
+    for span in spans:
+        rows.append({
+            "span": "  " * _depth(parents, span["span_id"]) + span["name"],
+            "start_ms": round((span["start_time_unix_nano"] - origin) / 1e6, 1),
+            "duration_ms": round(span["duration_ms"], 1),
+            "status": span["status"],
+            "attributes": " ".join(f"{k}={v}" for k, v in span["attributes"].items()),
+        })
+    return rows
+
+
+@st.fragment
+def timing_panel(tracer, trace_id):
+    """
+    Optional table of where the last request spent its time.
+
+    Queue and model time come from the run's timestamps, which the API
+    reports in whole seconds; everything else is measured locally.
+    """
+    if not trace_id or not st.toggle("Show timings", key="show_timings"):
+        return
+
+    spans = tracer.trace(trace_id)
+    if not spans:
+        st.caption("No timings recorded for the last request")
+        return
+    st.dataframe([breakdown(spans)], hide_index=True)
+    st.dataframe(span_rows(spans), hide_index=True)
@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from refactor.months import normalize_month
+
+TOOL_CACHE_SIZE = int(os.environ.get("TOOL_CACHE_SIZE", "1024"))
+# Outputs covering the current (or a future) period are only kept this long
+TOOL_CACHE_CURRENT_TTL = float(os.environ.get("TOOL_CACHE_CURRENT_TTL", "60"))
+# Optional SQLite file backing the in-memory cache; unset keeps it in memory only
+TOOL_CACHE_PATH = os.environ.get("TOOL_CACHE_PATH")
+
+MONTH_ARGUMENTS = ("month", "months")
+YEAR_ARGUMENTS = ("year", "years")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _split(value):
+    parts = value if isinstance(value, (list, tuple)) else str(value).split(",")
+    return [str(part).strip() for part in parts if str(part).strip()]
+
+
+def _month_slots(arguments):
+    slots = []
+    for key in MONTH_ARGUMENTS:
+        if arguments.get(key):
+            slots.extend(normalize_month(month) for month in _split(arguments[key]))
+    return slots
+
+
+def canonical_arguments(arguments):
+    """
+    Return a stable string for tool-call arguments.
+
+    Keys are sorted, empty arguments dropped, list arguments accept either
+    lists or comma-separated strings, and month spellings are mapped to
+    their slot, so "Jan", "januari" and 1 share a cache entry.
+    """
+    canonical = {}
+    for key, value in arguments.items():
+        if value is None or value == "" or value == []:
+            continue
+        parts = _split(value)
+        if key in MONTH_ARGUMENTS:
+            parts = [
+                str(slot) if (slot := normalize_month(part)) is not None else part.lower()
+                for part in parts
+            ]
+        canonical[key] = parts
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+
+def period_ttl(arguments, now=None, current_ttl=TOOL_CACHE_CURRENT_TTL):
+    """
+    Return how long an output for `arguments` may be cached, None meaning
+    until the data version changes.
+
+    Closed periods (past years, and past months of the current year) only
+    change through writes, which bump the data version, so their outputs
+    have no time limit. Anything touching the current month, a future
+    period or an unrecognized one gets `current_ttl`.
+    """
+    now = now or datetime.now()
+    try:
+        years = [int(year) for key in YEAR_ARGUMENTS if arguments.get(key)
+                 for year in _split(arguments[key])]
+    except ValueError:
+        return current_ttl
+    if not years:
+        return current_ttl
+
+    slots = _month_slots(arguments)
+    if None in slots:
+        return current_ttl
+    for year in years:
+        if year > now.year:
+            return current_ttl
+        if year == now.year and (not slots or max(slots) >= now.month - 1):
+            return current_ttl
+    return None
+
+
+class ToolOutputCache:
+    """
+    LRU cache of tool outputs, keyed by data version, function name and
+    canonical arguments.
+
+    Every lookup passes the sales data version (see
+    sales_client.data_version) its outputs must come from. A write to the
+    sales data bumps the version, so outputs fetched before it are never
+    served again; the first lookup with a new version drops them. A
+    version of None (unknown) bypasses the cache.
+
+    Within a version, how long an output stays valid is decided per
+    function: `ttls` maps a function name to a number of seconds, None (no
+    time limit) or a callable taking the arguments; functions not listed
+    use `period_ttl`. When `path` is given, outputs are also written to a
+    SQLite file, so closed periods survive restarts and are shared between
+    processes.
+    """
+
+    def __init__(self, max_entries=TOOL_CACHE_SIZE, path=None, ttls=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.misses = 0
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path:
+            with self._connect() as db:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS tool_outputs (
+                        key TEXT PRIMARY KEY,
+                        expires_at REAL,
+                        output TEXT NOT NULL
+                    )
+                    """
+                )
+
+    @classmethod
+    def from_env(cls):
+        return cls(max_entries=TOOL_CACHE_SIZE, path=TOOL_CACHE_PATH)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def ttl(self, func_name, arguments):
+        policy = self.ttls.get(func_name, period_ttl)
+        return policy(arguments) if callable(policy) else policy
+
+    def _remember(self, key, expires_at, output):
+        self._entries[key] = (expires_at, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _check_version(self, version):
+        if version == self.version:
+            return
+        # Outputs of older versions can never be served again; drop them here and on disk
+        self._entries.clear()
+        if self.path:
+            prefix = f"{version}:"
+            with self._connect() as db:
+                db.execute(
+                    "DELETE FROM tool_outputs WHERE substr(key, 1, ?) != ?",
+                    (len(prefix), prefix),
+                )
+        self.version = version
+
+    def get(self, func_name, arguments, version):
+        """
+        Return the cached output of this call for data `version`, or None.
+        """
+        if version is None:
+            return None
+
+        key = f"{version}:{func_name}:{canonical_arguments(arguments)}"
+        now = time.time()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+            if self.path:
+                with self._connect() as db:
+                    row = db.execute(
+                        "SELECT expires_at, output FROM tool_outputs WHERE key = ? "
+                        "AND (expires_at IS NULL OR expires_at > ?)",
+                        (key, now),
+                    ).fetchone()
+                if row is not None:
+                    self._remember(key, *row)
+                    self.hits += 1
+                    return row[1]
+
+            self.misses += 1
+            return None
+
+    def put(self, func_name, arguments, output, version):
+        ttl = self.ttl(func_name, arguments)
+        if version is None or (ttl is not None and ttl <= 0):
+            return
+
+        key = f"{version}:{func_name}:{canonical_arguments(arguments)}"
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._check_version(version)
+            self._remember(key, expires_at, output)
+            if self.path:
+                with self._connect() as db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO tool_outputs (key, expires_at, output) "
+                        "VALUES (?, ?, ?)",
+                        (key, expires_at, output),
+                    )
+
+    def clear(self):
+        """
+        Drop every cached output.
+        """
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                with self._connect() as db:
+                    db.execute("DELETE FROM tool_outputs")
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_tool_cache():
+    """
+    Return the process-wide tool-output cache, configured from TOOL_CACHE_* variables.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ToolOutputCache.from_env()
+    return _cache
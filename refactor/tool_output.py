@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+import math
+import os
+from functools import lru_cache
+
+from refactor.months import month_name, normalize_month
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a character estimate
+    tiktoken = None
+
+# Default token budget for one tool output submitted back to a run
+TOOL_OUTPUT_TOKENS = int(os.environ.get("TOOL_OUTPUT_TOKENS", "1500"))
+TOKEN_ENCODING = os.environ.get("TOKEN_ENCODING", "cl100k_base")
+
+METRIC_COLUMNS = ("sales", "revenue", "expenses")
+
+
+@lru_cache(maxsize=None)
+def _encoding(name):
+    return tiktoken.get_encoding(name)
+
+
+def count_tokens(text):
+    """
+    Return the number of tokens in `text`, estimated at 4 characters per token without tiktoken.
+    """
+    if tiktoken is not None:
+        return len(_encoding(TOKEN_ENCODING).encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def to_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows([row.get(column, "") for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+def _product_rows(products, **keys):
+    return [{**keys, "product": product, **metrics} for product, metrics in products.items()]
+
+
+def tabulate(payload):
+    """
+    Return (columns, rows) for the sales API payloads that are tables, or None.
+
+    Handles a month's products, a year of months and the rows of a query.
+    """
+    if not isinstance(payload, dict):
+        return None
+
+    if isinstance(payload.get("rows"), list):
+        rows = payload["rows"]
+        columns = [*payload.get("group_by", []), *METRIC_COLUMNS]
+        if any("records" in row for row in rows):
+            columns.append("records")
+        return columns, rows
+
+    if isinstance(payload.get("products"), dict):
+        return ["product", *METRIC_COLUMNS], _product_rows(payload["products"])
+
+    slots = {month: normalize_month(month) for month in payload}
+    if payload and None not in slots.values() and all(
+        isinstance(value, dict) and "products" in value for value in payload.values()
+    ):
+        rows = []
+        for month in sorted(payload, key=slots.get):
+            rows.extend(_product_rows(payload[month]["products"], month=month_name(slots[month])))
+        return ["month", "product", *METRIC_COLUMNS], rows
+    return None
+
+
+def summarize(columns, rows):
+    """
+    Pre-aggregate a table into metric totals per value of each dimension column.
+    """
+    metrics = [column for column in columns if column in METRIC_COLUMNS]
+    blocks = []
+    for dimension in columns:
+        if dimension in metrics or dimension == "records":
+            continue
+        totals = {}
+        for row in rows:
+            group = totals.setdefault(row.get(dimension), dict.fromkeys(metrics, 0))
+            for metric in metrics:
+                group[metric] += row.get(metric) or 0
+        if len(totals) == len(rows):
+            continue  # nothing to aggregate along this dimension
+        blocks.append(
+            f"totals by {dimension}\n"
+            + to_csv([dimension, *metrics], [{dimension: key, **group} for key, group in totals.items()])
+        )
+    return "\n".join(blocks)
+
+
+def _truncate(text, budget):
+    lines = text.splitlines(keepends=True)
+    kept = []
+    used = 0
+    for index, line in enumerate(lines):
+        cost = count_tokens(line)
+        if used + cost > budget - 16:  # leave room for the note
+            kept.append(f"... {len(lines) - index} more lines omitted\n")
+            break
+        kept.append(line)
+        used += cost
+    return "".join(kept)
+
+
+def shape_output(payload, budget=TOOL_OUTPUT_TOKENS):
+    """
+    Encode a tool result as the most complete text that fits in `budget` tokens.
+
+    Tabular payloads are written as CSV, which carries the same numbers
+    as the nested JSON in a fraction of the tokens, and fall back to
+    totals per dimension when the CSV is over budget. Anything else is
+    compact JSON. If even the smallest encoding is over budget it is cut
+    at a line boundary with a note saying how much was left out.
+    """
+    table = tabulate(payload)
+    if table is None:
+        encoded = json.dumps(payload, separators=(",", ":"))
+        if count_tokens(encoded) <= budget:
+            return encoded
+        # One value per line, so the cut below keeps whole values
+        return _truncate(json.dumps(payload, indent=0, separators=(",", ":")), budget)
+
+    encoded = to_csv(*table)
+    if count_tokens(encoded) <= budget:
+        return encoded
+    summary = summarize(*table)
+    if summary:
+        encoded = f"{len(table[1])} rows, aggregated\n{summary}"
+        if count_tokens(encoded) <= budget:
+            return encoded
+    return _truncate(encoded, budget)
@@ -0,0 +1,231 @@
+import inspect
+import threading
+import time
+import types
+import typing
+from dataclasses import dataclass, field
+
+JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+class ToolArgumentError(ValueError):
+    """
+    Raised when a tool call's arguments do not match the tool's signature.
+    """
+
+
+def _split(value):
+    parts = value if isinstance(value, (list, tuple)) else str(value).split(",")
+    return [str(part).strip() for part in parts if str(part).strip()]
+
+
+def _convert_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "yes", "1"):
+        return True
+    if text in ("false", "no", "0"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+
+def _parameter(name, hint):
+    """
+    Return (JSON schema, converter) for a parameter annotated with `hint`.
+
+    Supported annotations are str, int, float, bool, list[...] of those and
+    Literal[...], optionally wrapped in Optional and in Annotated[..., "description"].
+    """
+    description = None
+    if typing.get_origin(hint) is typing.Annotated:
+        hint, *extras = typing.get_args(hint)
+        description = next((extra for extra in extras if isinstance(extra, str)), None)
+
+    if typing.get_origin(hint) in (typing.Union, types.UnionType):
+        hint = next(arg for arg in typing.get_args(hint) if arg is not type(None))
+
+    origin = typing.get_origin(hint)
+    if origin is typing.Literal:
+        choices = typing.get_args(hint)
+        schema = {"type": JSON_TYPES[type(choices[0])], "enum": list(choices)}
+
+        def convert(value):
+            if isinstance(value, str):
+                value = value.strip()
+            if value not in choices:
+                raise ValueError(f"expected one of {', '.join(map(str, choices))}, got {value!r}")
+            return value
+    elif origin is list:
+        (item,) = typing.get_args(hint) or (str,)
+        schema = {"type": "array", "items": {"type": JSON_TYPES[item]}}
+
+        def convert(value):
+            return [item(part) for part in _split(value)]
+    elif hint in JSON_TYPES:
+        schema = {"type": JSON_TYPES[hint]}
+        if hint is str:
+            def convert(value):
+                return str(value).strip()
+        elif hint is bool:
+            convert = _convert_bool
+        else:
+            convert = hint
+    else:
+        raise TypeError(f"Unsupported annotation for tool parameter '{name}': {hint!r}")
+
+    if description:
+        schema["description"] = description
+    return schema, convert
+
+
+@dataclass
+class Tool:
+    """
+    A registered tool function with its schema, argument converters and timings.
+    """
+
+    name: str
+    func: typing.Callable
+    schema: dict
+    converters: dict
+    required: tuple
+    calls: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def parse(self, arguments):
+        """
+        Validate tool-call arguments and convert them to the signature's types.
+
+        Arguments the function does not take are dropped, and empty optional
+        arguments are left out so the function's defaults apply.
+        """
+        missing = [name for name in self.required if arguments.get(name) in (None, "")]
+        if missing:
+            raise ToolArgumentError(f"{self.name}: missing required argument(s) {', '.join(missing)}")
+
+        parsed = {}
+        for name, convert in self.converters.items():
+            value = arguments.get(name)
+            if value in (None, ""):
+                continue
+            try:
+                parsed[name] = convert(value)
+            except (TypeError, ValueError) as e:
+                raise ToolArgumentError(f"{self.name}: invalid argument '{name}': {e}") from e
+        return parsed
+
+    def record(self, seconds, failed):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self.seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+
+class ToolRegistry:
+    """
+    Tool functions for an assistant, keyed by name.
+
+    Decorate a function with `@registry.tool` to register it. Its JSON
+    schema is built from the signature: parameter types from the
+    annotations, descriptions from Annotated metadata and the function's
+    docstring, and parameters without a default are required. `call`
+    dispatches by name with a dict lookup, converts the arguments and
+    records how long each tool takes.
+    """
+
+    def __init__(self):
+        self._tools = {}
+
+    def tool(self, func=None, *, name=None, description=None):
+        def register(func):
+            tool_name = name or func.__name__
+            hints = typing.get_type_hints(func, include_extras=True)
+            properties = {}
+            converters = {}
+            required = []
+            for parameter in inspect.signature(func).parameters.values():
+                hint = hints.get(parameter.name, str)
+                properties[parameter.name], converters[parameter.name] = _parameter(parameter.name, hint)
+                if parameter.default is inspect.Parameter.empty:
+                    required.append(parameter.name)
+
+            doc = inspect.getdoc(func) or ""
+            schema = {
+                "type": "function",
+                "function": {
+                    "name": tool_name,
+                    "description": description or " ".join(doc.split("\n\n")[0].split()),
+                    "parameters": {
+                        "type": "object",
+                        "properties": properties,
+                        "required": required,
+                    },
+                },
+            }
+            self._tools[tool_name] = Tool(tool_name, func, schema, converters, tuple(required))
+            return func
+
+        return register(func) if func is not None else register
+
+    def __contains__(self, name):
+        return name in self._tools
+
+    def get(self, name):
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown Function: {name}")
+        return tool
+
+    def schemas(self):
+        """
+        Return the tool definitions to pass as `tools` when creating an assistant.
+        """
+        return [tool.schema for tool in self._tools.values()]
+
+    def call(self, name, arguments):
+        tool = self.get(name)
+        kwargs = tool.parse(arguments)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = tool.func(**kwargs)
+            failed = False
+            return result
+        finally:
+            tool.record(time.perf_counter() - start, failed)
+
+    async def call_async(self, name, arguments):
+        """
+        Like `call`, awaiting the result when the tool is a coroutine function.
+        """
+        tool = self.get(name)
+        kwargs = tool.parse(arguments)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = tool.func(**kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            failed = False
+            return result
+        finally:
+            tool.record(time.perf_counter() - start, failed)
+
+    def stats(self):
+        """
+        Return {tool name: call count, error count, mean and max latency in ms}.
+        """
+        return {
+            tool.name: {
+                "calls": tool.calls,
+                "errors": tool.errors,
+                "mean_ms": round(1000 * tool.seconds / tool.calls, 1) if tool.calls else None,
+                "max_ms": round(1000 * tool.max_seconds, 1),
+            }
+            for tool in self._tools.values()
+        }
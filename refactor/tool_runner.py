@@ -0,0 +1,48 @@
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Upper bound on tool calls running at once across the whole process
+MAX_TOOL_WORKERS = int(os.environ.get("MAX_TOOL_WORKERS", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Return the process-wide thread pool used for tool calls.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_TOOL_WORKERS, thread_name_prefix="tool-call"
+                )
+    return _executor
+
+
+def run_tool_calls(tool_calls, execute):
+    """
+    Run `execute(tool_call)` for every tool call concurrently.
+
+    Outputs come back in the order of `tool_calls`, so each stays paired
+    with its tool_call_id. If a call raises, the exception of the first
+    failing call (in that order) is re-raised once every call has finished.
+    Each call runs in a copy of the caller's context, so context variables
+    such as the current tracing span carry over to the pool threads.
+    """
+    if len(tool_calls) <= 1:
+        return [execute(tool_call) for tool_call in tool_calls]
+
+    futures = [
+        get_executor().submit(contextvars.copy_context().run, execute, tool_call)
+        for tool_call in tool_calls
+    ]
+    errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
@@ -0,0 +1,214 @@
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:  # OpenTelemetry is optional; spans still go to JSON lines and the panel
+    otel_trace = None
+
+# Append finished spans as JSON lines to this file; unset disables the file export
+TRACE_PATH = os.environ.get("TRACE_PATH")
+# Also forward spans to the OpenTelemetry SDK when it is installed
+TRACE_OTEL = os.environ.get("TRACE_OTEL", "1") not in ("0", "false", "no")
+# Number of recent traces kept in memory for the timing panel
+TRACE_KEEP = int(os.environ.get("TRACE_KEEP", "100"))
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+class Span:
+    """
+    One timed operation in a trace.
+
+    `to_dict` uses OpenTelemetry's field names (hex trace and span IDs,
+    unix-nanosecond times, attributes, status), so the JSON lines can be
+    loaded by OTel-aware tooling.
+    """
+
+    def __init__(self, tracer, name, parent=None, attributes=None, start_ns=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = dict(attributes or {})
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns = None
+        self.status = "OK"
+
+        self._otel = None
+        if tracer.otel is not None:
+            context = otel_trace.set_span_in_context(parent._otel) if parent and parent._otel else None
+            self._otel = tracer.otel.start_span(name, context=context, start_time=self.start_ns)
+
+    @property
+    def duration_ms(self):
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes):
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+        return self
+
+    def fail(self, error):
+        self.status = "ERROR"
+        self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def end(self, end_ns=None):
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        if self._otel is not None:
+            self._otel.set_attributes(self.attributes)
+            if self.status == "ERROR":
+                self._otel.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+            self._otel.end(end_time=self.end_ns)
+        self.tracer._finish(self)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class Tracer:
+    """
+    Records spans for assistant runs.
+
+    `span` is a context manager that nests under the current span of the
+    calling context, or an explicit `parent` (tool calls on the pool
+    inherit the current span through tool_runner). `record` adds a span
+    with known start and end times, e.g. the queue time reported on a
+    run. Finished spans are appended to `path` as JSON lines, forwarded
+    to OpenTelemetry when it is installed, and the last `keep` traces are
+    held in memory for `trace`.
+    """
+
+    def __init__(self, path=None, otel=TRACE_OTEL, keep=TRACE_KEEP):
+        self.path = path
+        self.keep = keep
+        self.otel = otel_trace.get_tracer("sales-assistant") if otel and otel_trace else None
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(path=TRACE_PATH)
+
+    @staticmethod
+    def current():
+        return _current_span.get()
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        span = Span(self, name, parent=parent or _current_span.get(), attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.fail(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def start(self, name, parent=None, **attributes):
+        """
+        Start a span without making it current; the caller must `end` it.
+
+        For generators, which cannot safely set and reset the current span
+        across their yields; pass the span as `parent` to nest under it.
+        """
+        return Span(self, name, parent=parent or _current_span.get(), attributes=attributes)
+
+    def record(self, name, start_s, end_s, parent=None, **attributes):
+        """
+        Add a finished span from unix-second timestamps (as reported by the API).
+        """
+        span = Span(self, name, parent=parent or _current_span.get(), attributes=attributes,
+                    start_ns=int(start_s * 1e9))
+        span.end(int(end_s * 1e9))
+        return span
+
+    def _finish(self, span):
+        record = span.to_dict()
+        with self._lock:
+            spans = self._traces.setdefault(span.trace_id, [])
+            spans.append(record)
+            self._traces.move_to_end(span.trace_id)
+            while len(self._traces) > self.keep:
+                self._traces.popitem(last=False)
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    def trace(self, trace_id):
+        """
+        Return the finished spans of a trace, in start order.
+        """
+        with self._lock:
+            spans = list(self._traces.get(trace_id, ()))
+        return sorted(spans, key=lambda span: span["start_time_unix_nano"])
+
+
+def run_usage(run):
+    """
+    Return a run's token usage as span attributes, or {} before it is known.
+    """
+    usage = getattr(run, "usage", None)
+    if not usage:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+
+def record_run_phases(tracer, run, tool_seconds=0.0, parent=None):
+    """
+    Add queue and model spans derived from a finished run's timestamps.
+
+    Queue time runs from creation until the run started; model time is
+    the rest of the run minus the time spent executing tools locally. The
+    API reports these timestamps in whole seconds.
+    """
+    if not (run.created_at and run.started_at):
+        return
+    tracer.record("run.queue", run.created_at, run.started_at, parent=parent, run_id=run.id)
+    ended_at = run.completed_at or run.failed_at or run.cancelled_at or run.expired_at
+    if ended_at:
+        tracer.record(
+            "run.model", run.started_at, ended_at, parent=parent, run_id=run.id,
+            model_seconds=max(ended_at - run.started_at - tool_seconds, 0),
+            **run_usage(run),
+        )
+
+
+def get_tracer():
+    """
+    Return the process-wide tracer, configured from TRACE_* variables.
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer.from_env()
+    return _tracer
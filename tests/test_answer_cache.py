@@ -0,0 +1,42 @@
+import pytest
+
+from refactor.answer_cache import AnswerCache, normalize_prompt
+
+
+@pytest.fixture
+def cache():
+    return AnswerCache(threshold=0.8)
+
+
+def test_near_identical_prompt_hits(cache):
+    cache.put("What were the total sales of ProductA in March 2023?", "v1", "answer")
+    assert cache.get("total sales ProductA in Maret 2023", "v1") == "answer"
+    assert cache.get("Tolong berikan total penjualan produk A bulan Maret tahun 2023", "v1") == "answer"
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("which product had the lowest sales in 2023", "which product had the highest sales in 2023"),
+    ("total sales ProductA in Maret 2023", "total sales ProductB in Maret 2023"),
+    ("total sales ProductA in Maret 2023", "total revenue ProductA in Maret 2023"),
+    ("compare sales 2023 vs 2024", "compare sales 2024 vs 2023"),
+    ("sales 2023", "sales 2024"),
+])
+def test_different_question_misses(cache, cached, asked):
+    cache.put(cached, "v1", "answer")
+    assert cache.get(asked, "v1") is None
+
+
+def test_new_version_drops_answers(cache):
+    cache.put("sales 2023", "v1", "answer")
+    assert cache.get("sales 2023", "v2") is None
+
+
+def test_anchors_ignore_order_across_kinds():
+    assert normalize_prompt("sales ProductA 2023")[1] == normalize_prompt("2023 ProductA sales")[1]
+
+
+def test_product_identifiers():
+    assert normalize_prompt("which product had the lowest sales")[1] == (
+        ("metric", ("sales",)), ("rank", ("lowest",)),
+    )
+    assert normalize_prompt("produk B")[1] == normalize_prompt("ProductB")[1]
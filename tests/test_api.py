@@ -0,0 +1,116 @@
+import pytest
+
+from refactor import api
+from refactor.sales_seed import data
+from refactor.sales_store import SalesStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    path = str(tmp_path / "sales.bin")
+    SalesStore.from_nested(data).save(path)
+    monkeypatch.setattr(api, "store", SalesStore.open(path))
+    api.response_cache.clear()
+    return api.app.test_client()
+
+
+def record(year="2023", month="Maret", product="ProductA", **metrics):
+    return {"year": year, "month": month, "product": product, **metrics}
+
+
+def errors(client, method, status, reason):
+    """
+    Return the error count the metrics endpoint reports for one label set.
+    """
+    for line in client.get("/metrics").get_data(as_text=True).splitlines():
+        if (line.startswith("sales_api_errors_total{") and f'method="{method}"' in line
+                and f'status="{status}"' in line and f'reason="{reason}"' in line):
+            return int(line.rsplit(" ", 1)[1])
+    return 0
+
+
+def test_post_creates_then_replaces(client):
+    new = record(year="2030", sales=1, revenue=2, expenses=3)
+    assert client.post("/api/sales_revenue", json=new).status_code == 201
+    assert client.post("/api/sales_revenue", json={**new, "sales": 5}).status_code == 200
+
+    response = client.get("/api/sales_revenue?year=2030&month=Maret&product=ProductA")
+    assert response.get_json() == {"sales": 5, "revenue": 2, "expenses": 3}
+
+
+def test_post_rejects_unknown_month_without_creating_the_year(client):
+    response = client.post(
+        "/api/sales_revenue", json=record(year="2030", month="Foo", sales=1, revenue=1, expenses=1)
+    )
+    assert response.status_code == 400
+    assert client.get("/api/sales_revenue?year=2030").status_code == 404
+
+
+def test_patch_updates_some_metrics(client):
+    before = client.get("/api/sales_revenue?year=2023&month=Maret&product=ProductA").get_json()
+    response = client.patch("/api/sales_revenue", json=record(sales=7))
+    assert response.status_code == 200
+    assert response.get_json() == {**before, "sales": 7}
+
+
+def test_patch_missing_record_is_404(client):
+    before = errors(client, "PATCH", 404, "record")
+    response = client.patch("/api/sales_revenue", json=record(product="ProductNew", sales=1))
+    assert response.status_code == 404
+    assert errors(client, "PATCH", 404, "record") == before + 1
+
+
+def test_patch_out_of_range_metric_is_400(client):
+    before = errors(client, "PATCH", 400, "metric")
+    response = client.patch("/api/sales_revenue", json=record(sales=2 ** 70))
+    assert response.status_code == 400
+    assert "out of range" in response.get_json()["error"]
+    assert errors(client, "PATCH", 400, "metric") == before + 1
+
+
+def test_bulk_write_is_all_or_nothing(client):
+    url = "/api/sales_revenue?year=2023&month=Maret&product=ProductA"
+    before = client.get(url).get_json()
+
+    response = client.post("/api/sales_revenue/bulk", json={"records": [
+        record(sales=1), record(product="ProductB", sales=2 ** 63),
+    ]})
+    assert response.status_code == 400
+    assert client.get(url).get_json() == before
+
+    response = client.post(
+        "/api/sales_revenue/bulk", json=[record(sales=1), record(year="2031", sales=2)]
+    )
+    assert response.get_json() == {"upserted": 2, "created": 1}
+    assert client.get(url).get_json()["sales"] == 1
+
+
+def test_bulk_rejects_a_body_that_is_not_a_list(client):
+    assert client.post("/api/sales_revenue/bulk", json={"sales": 1}).status_code == 400
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_conditional_get_skips_building_the_body(client, monkeypatch, encoding):
+    url = "/api/sales_revenue?year=2023"
+    headers = {"Accept-Encoding": encoding}
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    assert first.headers.get("Content-Encoding", "identity") == encoding
+
+    api.response_cache.clear()
+    misses = api.response_cache.misses
+    monkeypatch.setattr(api.store, "year_payload", lambda y: pytest.fail("body was built"))
+    response = client.get(url, headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == first.headers["ETag"]
+    assert api.response_cache.misses == misses
+
+
+def test_conditional_get_after_a_write_gets_the_new_body(client):
+    url = "/api/sales_revenue?year=2023&month=Maret&product=ProductA"
+    etag = client.get(url).headers["ETag"]
+    client.patch("/api/sales_revenue", json=record(sales=7))
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["sales"] == 7
@@ -0,0 +1,59 @@
+from refactor.metrics import MetricsRegistry
+
+
+def worker(directory, hits):
+    registry = MetricsRegistry(directory)
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge("hits_total", "Hits.", lambda: hits, kind="counter")
+    registry.gauge("entries", "Entries.", lambda: hits * 10)
+    return registry, requests, latency
+
+
+def samples(text):
+    return dict(line.rsplit(" ", 1) for line in text.splitlines() if not line.startswith("#"))
+
+
+def test_single_process_render():
+    registry, requests, latency = worker(None, 3)
+    requests.inc(route="/a")
+    latency.observe(0.5)
+
+    rendered = samples(registry.render())
+    assert rendered['requests_total{route="/a"}'] == "1"
+    assert rendered['latency_seconds_bucket{le="1.0"}'] == "1"
+    assert rendered["hits_total"] == "3"
+    assert rendered["entries"] == "30"
+
+
+def test_workers_sharing_a_directory_are_summed(tmp_path):
+    a, a_requests, a_latency = worker(str(tmp_path), 2)
+    b, b_requests, b_latency = worker(str(tmp_path), 5)
+    a_requests.inc(route="/a")
+    a_requests.inc(route="/b")
+    b_requests.inc(3, route="/a")
+    a_latency.observe(0.05)
+    b_latency.observe(0.5)
+    b.flush()
+
+    # Whichever worker is scraped reports the same totals
+    for registry in (a, b):
+        rendered = samples(registry.render())
+        assert rendered['requests_total{route="/a"}'] == "4"
+        assert rendered['requests_total{route="/b"}'] == "1"
+        assert rendered['latency_seconds_bucket{le="0.1"}'] == "1"
+        assert rendered['latency_seconds_bucket{le="1.0"}'] == "2"
+        assert rendered["latency_seconds_count"] == "2"
+        assert rendered["hits_total"] == "7"
+        assert any(key.startswith('entries{pid="') for key in rendered)
+
+
+def test_exited_worker_counts_are_kept(tmp_path):
+    a, a_requests, _ = worker(str(tmp_path), 0)
+    a_requests.inc(route="/a")
+    a.flush()
+    del a
+
+    b, b_requests, _ = worker(str(tmp_path), 0)
+    b_requests.inc(route="/a")
+    assert samples(b.render())['requests_total{route="/a"}'] == "2"
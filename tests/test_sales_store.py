@@ -0,0 +1,199 @@
+import os
+
+import numpy as np
+import pytest
+
+from refactor import sales_store
+from refactor.sales_seed import data
+from refactor.sales_store import SalesStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "sales.bin")
+    SalesStore.from_nested(data).save(path)
+    return path
+
+
+def record(year, month, product, sales, revenue=0, expenses=0):
+    return {"year": year, "month": month, "product": product,
+            "sales": sales, "revenue": revenue, "expenses": expenses}
+
+
+def assert_consistent(store):
+    """
+    The stored totals must match the records they summarize.
+    """
+    n = len(store.products)
+    np.testing.assert_array_equal(store.month_totals, store.values[:, :, :n].sum(axis=2))
+    np.testing.assert_array_equal(store.year_totals, store.month_totals.sum(axis=1))
+
+
+def test_save_open_round_trip(path):
+    original = SalesStore.from_nested(data)
+    store = SalesStore.open(path)
+
+    assert store.years == original.years
+    assert store.products == original.products
+    assert store.month_labels == original.month_labels
+    for y in range(len(store.years)):
+        assert store.year_payload(y) == original.year_payload(y)
+        assert store.totals(y) == original.totals(y)
+    assert_consistent(store)
+
+
+def test_round_trip_keeps_stamps(path, tmp_path):
+    store = SalesStore.open(path)
+    store.upsert("2023", "Maret", "ProductA", record("2023", "Maret", "ProductA", 7))
+    y, m, p = store.year_slot("2023"), 2, store.product_slot("ProductA")
+
+    copy = str(tmp_path / "copy.bin")
+    store.save(copy)
+    reopened = SalesStore.open(copy)
+    assert reopened.stamp(y, m, p) == store.stamp(y, m, p)
+    assert reopened.data_stamp() == store.data_stamp()
+
+
+def test_writes_are_written_through(path):
+    store = SalesStore.open(path)
+    created = store.upsert("2023", "Maret", "ProductA", record("2023", "Maret", "ProductA", 42))
+    assert not created
+
+    reopened = SalesStore.open(path)
+    y, p = reopened.year_slot("2023"), reopened.product_slot("ProductA")
+    assert reopened.product_payload(y, 2, p)["sales"] == 42
+    assert_consistent(reopened)
+
+
+def test_new_product_is_written_in_place(path):
+    store = SalesStore.open(path)
+    inode = os.stat(path).st_ino
+    store.upsert("2023", "Maret", "ProductNew", record("2023", "Maret", "ProductNew", 5))
+
+    assert os.stat(path).st_ino == inode
+    reopened = SalesStore.open(path)
+    assert "ProductNew" in reopened.products
+    assert_consistent(reopened)
+
+
+def test_product_axis_grows_when_full(path):
+    store = SalesStore.open(path)
+    capacity = store.values.shape[2]
+    records = [
+        record("2023", "Maret", f"Product{i}", i)
+        for i in range(capacity - len(store.products) + 1)
+    ]
+    store.upsert_many(records)
+
+    reopened = SalesStore.open(path)
+    assert reopened.values.shape[2] > capacity
+    assert len(reopened.products) == capacity + 1
+    assert_consistent(reopened)
+
+
+def test_write_after_other_worker_changed_layout(path):
+    a = SalesStore.open(path)
+    b = SalesStore.open(path)
+
+    # A adds a year, which rewrites the file with a new layout
+    a.upsert("2030", "Januari", "ProductNew", record("2030", "Januari", "ProductNew", 1))
+    # B still has the old file mapped; its write must land in the new file
+    b.upsert("2023", "Januari", "ProductA", record("2023", "Januari", "ProductA", 100))
+    b.upsert("2021", "Januari", "ProductB", record("2021", "Januari", "ProductB", 200))
+
+    store = SalesStore.open(path)
+    assert "2030" in store.years and "ProductNew" in store.products
+    assert store.product_payload(store.year_slot("2023"), 0, store.product_slot("ProductA"))["sales"] == 100
+    assert store.product_payload(store.year_slot("2021"), 0, store.product_slot("ProductB"))["sales"] == 200
+    assert_consistent(store)
+
+
+def test_write_after_other_worker_wrote_in_place(path):
+    a = SalesStore.open(path)
+    b = SalesStore.open(path)
+    y, p = a.year_slot("2023"), a.product_slot("ProductA")
+    before = a.totals(y, 0)["total_sales"]
+    old = a.product_payload(y, 0, p)["sales"]
+
+    a.upsert("2023", "Januari", "ProductA", record("2023", "Januari", "ProductA", old + 10))
+    b.upsert("2023", "Januari", "ProductA", {"sales": old + 30})
+
+    store = SalesStore.open(path)
+    assert store.totals(y, 0)["total_sales"] == before + 30
+    assert_consistent(store)
+
+
+def test_refresh_picks_up_other_workers_writes(path):
+    a = SalesStore.open(path)
+    b = SalesStore.open(path)
+    assert not b.refresh()
+
+    a.upsert("2023", "Maret", "ProductA", record("2023", "Maret", "ProductA", 9))
+    assert b.refresh()
+    y, p = b.year_slot("2023"), b.product_slot("ProductA")
+    assert b.product_payload(y, 2, p)["sales"] == 9
+    assert b.stamp(y, 2, p) == a.stamp(y, 2, p)
+
+    a.upsert("2031", "Maret", "ProductA", record("2031", "Maret", "ProductA", 1))
+    assert b.refresh()
+    assert "2031" in b.years
+
+
+def test_refresh_while_another_thread_reloads(path, monkeypatch):
+    reader = SalesStore.open(path)
+    SalesStore.open(path).upsert("2023", "Maret", "ProductA", record("2023", "Maret", "ProductA", 9))
+
+    # Another thread reloads the store between the stale check's open and its read
+    read_header = sales_store._read_header
+    reloading = []
+
+    def reload_then_read(fd):
+        if not reloading:
+            reloading.append(True)
+            reader._load(path)
+        return read_header(fd)
+
+    monkeypatch.setattr(sales_store, "_read_header", reload_then_read)
+    reader.refresh()
+    assert reader.product_payload(reader.year_slot("2023"), 2, reader.product_slot("ProductA"))["sales"] == 9
+
+
+def test_invalid_month_leaves_no_phantom_year(path):
+    store = SalesStore.open(path)
+    with pytest.raises(ValueError):
+        store.upsert("2030", "Foo", "ProductA", record("2030", "Foo", "ProductA", 1))
+
+    assert store.year_slot("2030") is None
+    assert SalesStore.open(path).year_slot("2030") is None
+
+
+def test_bad_record_fails_the_whole_batch(path):
+    store = SalesStore.open(path)
+    y, p = store.year_slot("2024"), store.product_slot("ProductA")
+    before = store.product_payload(y, 0, p)
+    totals = store.totals(y)
+
+    with pytest.raises(ValueError, match="Record 1"):
+        store.upsert_many([
+            record("2024", "Januari", "ProductA", 100479),
+            record("2024", "Foo", "ProductA", 1),
+        ])
+    with pytest.raises(ValueError, match="out of range"):
+        store.upsert_many([
+            record("2024", "Januari", "ProductA", 100479),
+            record("2024", "Januari", "ProductB", 2 ** 63),
+        ])
+
+    # A later successful write must not persist anything from the failed batches
+    store.upsert("2023", "Maret", "ProductA", record("2023", "Maret", "ProductA", 1))
+    for current in (store, SalesStore.open(path)):
+        assert current.product_payload(y, 0, p) == before
+        assert current.totals(y) == totals
+        assert_consistent(current)
+
+
+def test_update_requires_existing_record(path):
+    store = SalesStore.open(path)
+    with pytest.raises(KeyError):
+        store.upsert("2024", "Januari", "ProductNew", {"sales": 1}, create=False)
+    assert store.product_slot("ProductNew") is None
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from refactor.thread_registry import ThreadRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ThreadRegistry(
+        path=str(tmp_path / "threads.sqlite3"), ttl=60, idle_ttl=10, max_runs=3, run_grace=20
+    )
+
+
+def test_current_thread_until_run_limit(registry):
+    registry.assign("s1", "t1")
+    for runs in range(3):
+        assert registry.current("s1") == "t1"
+        assert registry.runs("t1") == runs
+        registry.record_run("t1")
+    assert registry.current("s1") is None
+    assert registry.retired() == ["t1"]
+
+
+def test_abandoned_session_is_cleaned_up(registry, monkeypatch):
+    registry.assign("abandoned", "t1")
+    registry.assign("active", "t2")
+    assert registry.retired() == []
+
+    later = time.time() + 25
+    monkeypatch.setattr(time, "time", lambda: later)
+    registry.record_run("t2")
+
+    deleted = []
+    assert registry.cleanup(deleted.append) == 1
+    assert deleted == ["t1"]
+    assert registry.current("active") == "t2"
+
+
+def test_assign_retires_the_previous_thread(registry):
+    registry.assign("s1", "t1")
+    registry.assign("s1", "t2")
+    assert registry.current("s1") == "t2"
+    assert registry.retired() == ["t1"]
+
+
+def test_thread_mid_run_is_not_cleaned_up(registry, monkeypatch):
+    registry.assign("s1", "t1")
+    for _ in range(3):
+        registry.record_run("t1")
+
+    # Another session arriving must not delete t1 while its last run goes on
+    registry.assign("s2", "t2")
+    deleted = []
+    assert registry.cleanup(deleted.append) == 0
+
+    # Even past the idle TTL, a thread is kept while a run may still be polled
+    later = time.time() + 15
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert registry.cleanup(deleted.append) == 0
+    assert deleted == []
+
+    # The owning session still rotates it once the run limit is reached
+    assert registry.current("s1") is None
+    assert registry.cleanup(deleted.append) == 1
+    assert deleted == ["t1"]
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from refactor.tool_cache import ToolOutputCache, canonical_arguments, period_ttl
+
+
+def test_month_spellings_share_a_key():
+    assert canonical_arguments({"year": "2023", "month": "Maret"}) == \
+        canonical_arguments({"month": "mar", "year": "2023", "product": None})
+
+
+def test_closed_periods_have_no_time_limit():
+    now = datetime(2024, 6, 15)
+    assert period_ttl({"year": "2023", "month": "Maret"}, now=now) is None
+    assert period_ttl({"year": "2024", "month": "Juni"}, now=now) == 60
+
+
+def test_new_data_version_invalidates_outputs(tmp_path):
+    path = str(tmp_path / "tools.sqlite3")
+    cache = ToolOutputCache(path=path)
+    args = {"year": "2023", "month": "Maret"}
+    cache.put("get_sales_revenue", args, "old", "v1")
+    assert cache.get("get_sales_revenue", args, "v1") == "old"
+
+    # Once any process sees the new version, the old outputs are gone from disk too
+    other = ToolOutputCache(path=path)
+    assert other.get("get_sales_revenue", args, "v2") is None
+    assert cache.get("get_sales_revenue", args, "v2") is None
+    assert ToolOutputCache(path=path).get("get_sales_revenue", args, "v1") is None
+
+
+def test_unknown_version_bypasses_the_cache():
+    cache = ToolOutputCache()
+    cache.put("get_sales_revenue", {"year": "2023"}, "output", None)
+    assert len(cache) == 0
+    assert cache.get("get_sales_revenue", {"year": "2023"}, None) is None
@@ -2,27 +2,68 @@ import openai
 import os
 from dotenv import load_dotenv
 import requests
-import json
 import streamlit as st
 from datetime import datetime
-import time
+import uuid
+from typing import Annotated, Literal, Optional
+from refactor import sales_client
+from refactor.answer_cache import AnswerCache
+from refactor.assistant import AssistantManager as BaseAssistantManager
+from refactor.log import configure_logging
+from refactor.polling import RunFailedError
+from refactor.run_steps import run_steps_panel
+from refactor.timing_panel import timing_panel
+from refactor.tool_output import TOOL_OUTPUT_TOKENS
+from refactor.tool_registry import ToolRegistry
 # import plotly.express as px
 
 load_dotenv()
+configure_logging()
 
 # API keys
 news_api_key = os.environ.get("NEWS_API_KEY")
 weather_api_key = os.environ.get("WEATHER_API_KEY")
-client = openai.OpenAI()
 model = "gpt-3.5-turbo-16k"
 
-def get_sales_revenue(year):
-    url = f"http://127.0.0.1:5000/api/sales_revenue?year={year}"
-    
+# Token budget for each tool's output; larger outputs are summarized before submitting
+TOOL_TOKEN_BUDGETS = {
+    "get_sales_revenue": TOOL_OUTPUT_TOKENS,
+    "query_sales": TOOL_OUTPUT_TOKENS,
+    "get_sales_stats": TOOL_OUTPUT_TOKENS // 2,
+}
+
+# Streamlit re-runs this script on every interaction; build the client once per process
+@st.cache_resource
+def get_client():
+    return openai.OpenAI()
+
+@st.cache_resource
+def get_assistant(assistant_id):
+    return get_client().beta.assistants.retrieve(assistant_id=assistant_id)
+
+# Shared by every session, so one user's answer can serve another's near-identical prompt
+@st.cache_resource
+def get_answer_cache():
+    return AnswerCache()
+
+client = get_client()
+
+# The assistant's tools; each function's signature and docstring make up its schema
+sales_tools = ToolRegistry()
+
+@sales_tools.tool
+def get_sales_revenue(
+    year: Annotated[str, "The year for which to fetch the sales data."],
+    month: Annotated[Optional[str], "The month for which to fetch the sales data, in Indonesian or English or as a number, e.g., Maret, March or 3. Leave out for the whole year."] = None,
+):
+    """
+    Fetch the sales revenue and expenses details for a given year and month and also display the highest and lowest products
+    """
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            sales_data = response.json()
+        status_code, sales_data = sales_client.get_json(
+            "/api/sales_revenue", {"year": year, "month": month}
+        )
+        if status_code == 200:
             return sales_data
         else:
             return f"Error: Unable to fetch sales data for year {year}"
@@ -30,6 +71,53 @@ def get_sales_revenue(year):
     except requests.exceptions.RequestException as e:
         return f"Error occurred during API request: {e}"
 
+@sales_tools.tool
+def query_sales(
+    years: Annotated[str, "Comma-separated years, e.g., 2023,2024"],
+    months: Annotated[Optional[str], "Comma-separated months or ranges, e.g., Januari,Maret or Apr-Jun or Q2. Leave out for the whole year."] = None,
+    products: Annotated[Optional[str], "Comma-separated product names, e.g., ProductA,ProductB. Leave out for all products."] = None,
+    group_by: Annotated[Optional[str], "Comma-separated dimensions to break the totals down by: year, month and/or product."] = None,
+):
+    """
+    Total the sales, revenue and expenses over several years, a month range and a list of products in one call, e.g., to compare Q2 2023 with Q2 2024 for ProductB
+    """
+    params = {"years": years, "months": months, "products": products, "group_by": group_by}
+
+    try:
+        status_code, sales_data = sales_client.get_json("/api/sales_query", params)
+        if status_code == 200:
+            return sales_data
+        else:
+            return f"Error: Unable to query sales data for years {years}"
+
+    except requests.exceptions.RequestException as e:
+        return f"Error occurred during API request: {e}"
+
+@sales_tools.tool
+def get_sales_stats(
+    year: Annotated[str, "The year for which to compute the statistics."],
+    month: Annotated[Optional[str], "The month for which to compute the statistics. Leave out for the whole year."] = None,
+    metric: Annotated[Optional[Literal["sales", "revenue", "expenses"]], "Only return statistics for this metric."] = None,
+):
+    """
+    Get the highest and lowest products, the range, mean and percentiles of product quantities, revenue and expenses for a year or month, with month-over-month changes per product
+    """
+    params = {"year": year, "month": month, "metric": metric}
+
+    try:
+        status_code, stats = sales_client.get_json("/api/sales_stats", params)
+        if status_code == 200:
+            return stats
+        else:
+            return f"Error: Unable to fetch sales statistics for year {year}"
+
+    except requests.exceptions.RequestException as e:
+        return f"Error occurred during API request: {e}"
+
+def get_data_version():
+    # None when the API is unreachable, which disables the answer cache for the run
+    return sales_client.data_version()
+
 # def get_weather(city):
     url = f"https://api.openweathermap.org/data/2.5/weather?appid={weather_api_key}&q={city}"
     
@@ -74,143 +162,27 @@ def get_sales_revenue(year):
     except requests.exceptions.RequestException as e:
         return f"Error occurred during API request: {e}"
 
-class AssistantManager:
-    # thread_id = "thread_h35fO7EyjIYi2fP664TRU2Fo"
+class AssistantManager(BaseAssistantManager):
+    """
+    The sales assistant: the shared manager with the sales tools, whose
+    outputs are cached and shaped to a per-tool token budget.
+    """
     # assistant_id = "asst_uZ9Ew4iC857rCfmLyzL1MoFR"
-    thread_id = "thread_lJyOI9j9Kl8gvNB1xlGS0Nel"
     assistant_id = "asst_5yD5pIrURjhLk1VAsTVfI9A3"
 
-    def __init__(self, model: str = model):
-        self.client = client
-        self.model = model
-        self.assistant = None
-        self.thread = None
-        self.run = None
-        self.summary = None
-
-        # Retrieve existing assistant and thread if IDs are already set
-        if AssistantManager.assistant_id:
-            self.assistant = self.client.beta.assistants.retrieve(
-                assistant_id=AssistantManager.assistant_id
-            )
-        if AssistantManager.thread_id:
-            self.thread = self.client.beta.threads.retrieve(
-                thread_id=AssistantManager.thread_id
-            )
+    def __init__(self, model: str = model, **kwargs):
+        super().__init__(model, client=client, tools=sales_tools,
+                         tool_budgets=TOOL_TOKEN_BUDGETS, **kwargs)
 
-    def create_assistant(self, name, instructions, tools):
-        if not self.assistant:
-            assistant_obj = self.client.beta.assistants.create(
-                name=name,
-                instructions=instructions,
-                tools=tools,
-                model=self.model,
-            )
-            AssistantManager.assistant_id = assistant_obj.id
-            self.assistant = assistant_obj
-            print(f"AssisId::: {self.assistant.id}")
-
-    def create_thread(self):
-        if not self.thread:
-            thread_obj = self.client.beta.threads.create()
-            AssistantManager.thread_id = thread_obj.id
-            self.thread = thread_obj
-            print(f"ThreadId::; {self.thread.id}")
-
-    def add_message_to_thread(self, role, content):
-        if self.thread:
-            self.client.beta.threads.messages.create(
-                thread_id=self.thread.id,
-                role=role,
-                content=content
-            )
-
-    def run_assistant(self, instructions):
-        if self.thread and self.assistant:
-            self.run = self.client.beta.threads.runs.create(
-                thread_id=self.thread.id,
-                assistant_id=self.assistant.id,
-                instructions=instructions,
-            )
-
-    def process_message(self):
-        if self.thread:
-            messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread.id
-            )
-            summary = []
-
-            last_message = messages.data[0]
-            role = last_message.role
-            response = last_message.content[0].text.value
-            summary.append(response)
-
-            self.summary = "\n".join(summary)
-            print(f"SUMMARY-----> {role.capitalize()}: ==> {response}")
-
-    def call_required_functions(self, required_actions):
-        if not self.run:
-            return
-        tool_outputs = []
-
-        for action in required_actions["tool_calls"]:
-            func_name = action["function"]["name"]
-            arguments = json.loads(action["function"]["arguments"])
-
-            # if func_name == "get_weather":
-            #     # prompt
-            #     output = get_weather(city=arguments["city"]) 
-            #     print(f"YEAHHHH;;;;;{output}")
-            #     tool_outputs.append({"tool_call_id": action["id"], "output": output})
-                
-            if func_name == "get_sales_revenue":
-                # prompt
-                output = get_sales_revenue(year=arguments["year"])
-                print(f"Sales revenue output: {output}")
-                tool_outputs.append({"tool_call_id": action["id"], "output": json.dumps(output)})
-
-            else:
-                raise ValueError(f"Unknown Function: {func_name}")
-
-        print("SUBMITTING OUTPUT BACK TO THE ASSISTANT......")
-        self.client.beta.threads.runs.submit_tool_outputs(
-            thread_id=self.thread.id,
-            run_id=self.run.id,
-            tool_outputs=tool_outputs
-        )
-
-    def get_summary(self):
-        return self.summary
-
-    def wait_for_completion(self):
-        if self.thread and self.run:
-            while True:
-                time.sleep(5)
-                run_status = self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread.id,
-                    run_id=self.run.id
-                )
-                print(f"RUN STATUS:: {run_status.model_dump_json(indent=4)}")
-
-                if run_status.status == "completed":
-                    self.process_message()
-                    break
-                elif run_status.status == "requires_action":
-                    print("FUNCTION CALLING NOW...")
-                    self.call_required_functions(
-                        required_actions=run_status.required_action.submit_tool_outputs.model_dump()
-                    )
-
-    def run_steps(self):
-        run_steps = self.client.beta.threads.runs.steps.list(
-            thread_id=self.thread.id,
-            run_id=self.run.id
-        )
-        print(f"Run-steps::: {run_steps}")
-        return run_steps.data
-        
 def main():
-    manager = AssistantManager()
+    # Each browser session gets its own thread through the registry
+    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+    # Keep the manager across reruns so its resolved assistant and thread are reused
+    if "manager" not in st.session_state:
+        st.session_state.manager = AssistantManager(
+            session_id=session_id, assistant_loader=get_assistant
+        )
+    manager = st.session_state.manager
     
     # Streamlit interface
     st.title("Keuangan Perusahaan")
@@ -219,80 +191,88 @@ def main():
         # city = st.text_input("Enter city:")
         year = st.text_input("Masukkan Prompt:")
         # month = st.text_input("Enter month:")
+        stream_response = st.checkbox("Stream response", value=True)
         submit_button = st.form_submit_button(label="Run Assistant")
         
         if submit_button:
-            manager.create_assistant(
-                    name="Sales Revenue and expenses Summarizer",
-                    instructions="You are a sales data assistant who knows how to retrieve and summarize sales data for a given year and month. then find out the range of product quantities",
-                    tools=[
-                        {
-                            "type":"function",
-                            "function":{
-                                "name":"get_sales_revenue",
-                                "description":"Fetch the sales revenue and expenses details for a given year and month and also display the highest and lowest products",
-                                "parameters":{
-                                    "type":"object",
-                                    "properties":{
-                                        "year":{
-                                            "type":"string",
-                                            "description":"The year for which to fetch the sales data.",
-                                        },
-                                        "month":{
-                                            "type":"string",
-                                            "description":"The month for which to fetch the sales data.",
-                                        }
-                                    },
-                                    "required":["year", "month"],  
-                                },
-                            },
-                        }]
-            )
-            # manager.create_assistant(
-            #     name="Weather Summarizer",
-            #     instructions="You are a personal weather assistant who knows how to fetch weather details for a given city and provide a summary.",
-            #     tools=[
-            #         {
-            #         "type":"function",
-            #         "function":{
-            #             "name":"get_weather",
-            #             "description":"Fetch the weather details for a given city.",
-            #             "parameters":{
-            #                 "type":"object",
-            #                 "properties":{
-            #                     "city":{
-            #                         "type":"string",
-            #                         "description":"The city for which to fetch the weather, e.g., Bandung",
-            #                     }
-            #                 },
-            #                 "required":["city"],  
-            #             },
-            #         },
-            #     }]
-            # )
-            manager.create_thread()
-            
-            # Add the message and run the assistant
-            manager.add_message_to_thread(
-                role="user",
-                content=f"Provide the sales data for {year}"
+            # Everything below becomes one trace, shown in the timing panel
+            with manager.tracer.span("request", session_id=session_id) as request_span:
+                st.session_state.trace_id = request_span.trace_id
+                manager.create_assistant(
+                        name="Sales Revenue and expenses Summarizer",
+                        instructions="You are a sales data assistant who knows how to retrieve and summarize sales data for a given year and month. then find out the range of product quantities",
+                        tools=sales_tools.schemas(),
                 )
-            manager.run_assistant(instructions="Provide details of sales income and expenses including when required a range")
-            # manager.add_message_to_thread(
-            #     role="user",
-            #     content=f"Provide the weather details for {city}.",
-            # )
-            # manager.run_assistant(instructions="Provide the weather details.")
-            
-            # Wait for completions and process messages
-            manager.wait_for_completion()
-            
-            summary = manager.get_summary()
-            
-            st.write(summary)
+                # manager.create_assistant(
+                #     name="Weather Summarizer",
+                #     instructions="You are a personal weather assistant who knows how to fetch weather details for a given city and provide a summary.",
+                #     tools=[
+                #         {
+                #         "type":"function",
+                #         "function":{
+                #             "name":"get_weather",
+                #             "description":"Fetch the weather details for a given city.",
+                #             "parameters":{
+                #                 "type":"object",
+                #                 "properties":{
+                #                     "city":{
+                #                         "type":"string",
+                #                         "description":"The city for which to fetch the weather, e.g., Bandung",
+                #                     }
+                #                 },
+                #                 "required":["city"],  
+                #             },
+                #         },
+                #     }]
+                # )
+                manager.create_thread()
+                content = f"Provide the sales data for {year}"
+
+                # Near-identical prompts on unchanged data are answered without a run, but
+                # only as the thread's first turn: a follow-up's answer depends on earlier turns
+                answer_cache = get_answer_cache()
+                fresh = not manager.has_history()
+                data_version = get_data_version() if fresh else None
+                cached_answer = answer_cache.get(year, data_version) if fresh else None
+                if cached_answer is not None:
+                    # Add the turn to the thread anyway, so follow-ups have its context
+                    manager.record_answered_turn(content, cached_answer)
+                    st.write(cached_answer)
+                    st.caption("Answered from cache")
+                else:
+                    # Add the message and run the assistant
+                    manager.add_message_to_thread(
+                        role="user",
+                        content=content
+                        )
+                    instructions = "Provide details of sales income and expenses including when required a range"
+                    # manager.add_message_to_thread(
+                    #     role="user",
+                    #     content=f"Provide the weather details for {city}.",
+                    # )
+                    # manager.run_assistant(instructions="Provide the weather details.")
             
-            st.text("Runs Steps:")
-            st.code(manager.run_steps(), line_numbers=True)
+                    try:
+                        if stream_response:
+                            # Render the answer token by token as the run produces it
+                            answer = st.write_stream(manager.stream_assistant(instructions=instructions))
+                        else:
+                            # Wait for completions and process messages
+                            manager.run_assistant(instructions=instructions)
+                            manager.wait_for_completion()
+                    
+                            answer = manager.get_summary()
+                    
+                            st.write(answer)
+                    except (RunFailedError, TimeoutError) as e:
+                        st.error(str(e))
+                    else:
+                        if fresh and isinstance(answer, str):
+                            answer_cache.put(year, data_version, answer)
+
+    # Run steps and timings are only fetched when their panels are switched on
+    run_steps_panel(manager)
+    timing_panel(manager.tracer, st.session_state.get("trace_id"))
 
 if __name__ == "__main__":
     main()